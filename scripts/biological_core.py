@@ -3,13 +3,28 @@ import librosa
 import numpy as np
 import hashlib
 import json
+import os
+import scipy.fft
 from scipy import signal
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 warnings.filterwarnings('ignore')
 
+# Extracted biometrics keyed by audio content, so re-anchoring or re-running
+# a batch over the same files skips the librosa pipeline
+CACHE_DIR = os.path.join('proofs', '.cache')
+# Part of every cache file name; bump when extraction output changes so
+# stale biometrics are never reused
+CACHE_VERSION = 2
+
 class SovereignVoiceprint:
-    def __init__(self, sample_rate=44100):
+    def __init__(self, sample_rate=44100, pitch_tracker='pyin'):
+        # 'pyin' reproduces existing proofs; 'dio' (pyworld) is ~10x faster
+        # but yields different pitch statistics, hence a different hash
+        if pitch_tracker not in ('pyin', 'dio'):
+            raise ValueError(f"Unknown pitch tracker: {pitch_tracker}")
         self.sr = sample_rate
+        self.pitch_tracker = pitch_tracker
         self.biometric_data = {}
     
     def extract_universal_biometrics(self, audio_path):
@@ -17,19 +32,22 @@ class SovereignVoiceprint:
         print("🔬 Extracting universal biological metrics...")
         
         try:
-            y, sr = librosa.load(audio_path, sr=self.sr, duration=30)  # First 30 seconds
+            y, sr = librosa.load(audio_path, sr=self.sr, duration=30, dtype=np.float32)  # First 30 seconds
         except Exception as e:
             print(f"❌ Error loading audio: {e}")
             return None
         
+        # One shared STFT pass feeds both the formant and onset extractors
+        spectrum = self._analyze_spectrum(y, sr)
+        
         # 1. VOCAL TRACT PHYSICS
-        self.biometric_data['vocal_tract'] = self._extract_vocal_tract_physics(y, sr)
+        self.biometric_data['vocal_tract'] = self._extract_vocal_tract_physics(spectrum)
         
         # 2. CORD ELASTICITY  
         self.biometric_data['cord_elasticity'] = self._extract_cord_elasticity(y, sr)
         
         # 3. NEUROMUSCULAR TIMING
-        self.biometric_data['neuromuscular_timing'] = self._extract_neuromuscular_timing(y, sr)
+        self.biometric_data['neuromuscular_timing'] = self._extract_neuromuscular_timing(y, sr, spectrum)
         
         # 4. BREATH CONTROL
         self.biometric_data['breath_control'] = self._extract_breath_control(y, sr)
@@ -39,10 +57,10 @@ class SovereignVoiceprint:
         
         return self.biometric_data
     
-    def _extract_vocal_tract_physics(self, y, sr):
+    def _extract_vocal_tract_physics(self, spectrum):
         """Vocal tract length and formant structure"""
         # Extract formants from vowel regions
-        formants = self._extract_formants(y, sr)
+        formants = self._extract_formants(spectrum)
         
         # Vocal tract length estimation (simplified)
         if len(formants) >= 2:
@@ -60,14 +78,12 @@ class SovereignVoiceprint:
     
     def _extract_cord_elasticity(self, y, sr):
         """Vocal fold elasticity via pitch dynamics"""
-        f0, voiced_flag, voiced_probs = librosa.pyin(
-            y, fmin=80, fmax=400, sr=sr, frame_length=2048
-        )
-        f0_clean = f0[voiced_flag & ~np.isnan(f0)]
+        f0_clean, tracker = self._track_pitch(y, sr)
         
         if len(f0_clean) > 0:
-            pitch_range = np.max(f0_clean) - np.min(f0_clean)
-            pitch_octaves = np.log2(np.max(f0_clean) / np.min(f0_clean)) if np.min(f0_clean) > 0 else 0
+            f0_min, f0_max = np.min(f0_clean), np.max(f0_clean)
+            pitch_range = f0_max - f0_min
+            pitch_octaves = np.log2(f0_max / f0_min) if f0_min > 0 else 0
         else:
             pitch_range = 0
             pitch_octaves = 0
@@ -75,12 +91,33 @@ class SovereignVoiceprint:
         return {
             'pitch_range_hz': float(pitch_range),
             'pitch_range_octaves': float(pitch_octaves),
-            'mean_pitch_hz': float(np.mean(f0_clean)) if len(f0_clean) > 0 else 0
+            'mean_pitch_hz': float(np.mean(f0_clean)) if len(f0_clean) > 0 else 0,
+            'pitch_tracker': tracker
         }
     
-    def _extract_neuromuscular_timing(self, y, sr):
+    def _track_pitch(self, y, sr):
+        """Voiced F0 values (Hz) and the name of the tracker that produced them"""
+        if self.pitch_tracker == 'dio':
+            try:
+                import pyworld as pw
+            except ImportError:
+                print("⚠️ pyworld not installed, falling back to pyin")
+            else:
+                x = y.astype(np.float64)
+                f0, t = pw.dio(x, sr, f0_floor=80, f0_ceil=400, frame_period=10.0)
+                f0 = pw.stonemask(x, f0, t, sr)
+                return f0[f0 > 0], 'dio'
+        
+        f0, voiced_flag, voiced_probs = librosa.pyin(
+            y, fmin=80, fmax=400, sr=sr, frame_length=2048
+        )
+        return f0[np.isfinite(f0) & voiced_flag], 'pyin'
+    
+    def _extract_neuromuscular_timing(self, y, sr, spectrum):
         """Articulation coordination speed"""
-        onset_frames = librosa.onset.onset_detect(y=y, sr=sr, hop_length=512, delta=0.1)
+        onset_frames = librosa.onset.onset_detect(
+            onset_envelope=spectrum['onset_envelope'], sr=sr, hop_length=512, delta=0.1
+        )
         onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=512)
         
         if len(onset_times) > 1:
@@ -102,6 +139,8 @@ class SovereignVoiceprint:
         # Energy envelope analysis
         frame_length = 1024
         hop_length = 256
+        # Stays on librosa: breath_control is hashed at .6f, and a running-sum
+        # RMS differs by ~1e-8, enough to flip the hash on some recordings
         rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
         
         # Simple breath group detection (energy dips)
@@ -145,43 +184,80 @@ class SovereignVoiceprint:
             'analyzed_segments': len(segments) if len(segments) >= 2 else 0
         }
     
-    def _extract_formants(self, y, sr, num_formants=3):
+    def _extract_formants(self, spectrum, num_formants=3):
         """Simple formant extraction using spectral peaks"""
-        # Focus on typical speech range
-        D = librosa.stft(y)
-        S = np.abs(D)
-        freqs = librosa.fft_frequencies(sr=sr)
-        
-        # Find spectral peaks in speech range (100-4000 Hz)
-        speech_mask = (freqs >= 100) & (freqs <= 4000)
-        speech_freqs = freqs[speech_mask]
-        speech_S = np.mean(S[speech_mask, :], axis=1)
+        # Spectral peaks in speech range (100-4000 Hz)
+        speech_freqs = spectrum['speech_freqs']
+        speech_S = spectrum['speech_magnitude']
+        
+        # Interior peaks at least 100 bins apart can't number more than this;
+        # at 44.1 kHz the 100-4000 Hz band is only ~180 bins wide, so the
+        # peak search can never succeed and is skipped
+        min_distance = 100
+        max_peaks = (len(speech_S) - 3) // min_distance + 1 if len(speech_S) >= 3 else 0
+        if max_peaks < num_formants:
+            return [500, 1500, 2500][:num_formants]
         
         # Find prominent peaks (formants)
-        peaks, _ = signal.find_peaks(speech_S, height=np.max(speech_S)*0.1, distance=100)
+        peaks, _ = signal.find_peaks(speech_S, height=np.max(speech_S)*0.1, distance=min_distance)
         
         formant_freqs = speech_freqs[peaks[:num_formants]] if len(peaks) >= num_formants else [500, 1500, 2500][:num_formants]
         
         return formant_freqs
-    
+
+    def _analyze_spectrum(self, y, sr, n_fft=2048, hop_length=512, block_frames=256):
+        """Shared STFT pass for the formant and onset extractors.
+
+        Frames the signal the way librosa.stft does (centered, zero-padded,
+        Hann window) and walks it block by block, so the full complex matrix
+        is never built. Each block contributes to the time-averaged magnitude
+        of the speech bins and to the mel spectrogram onset detection needs.
+        The FFT runs in y's precision (complex64 for float32 audio); the
+        speech-band average is still accumulated in float64.
+        """
+        freqs = librosa.fft_frequencies(sr=sr, n_fft=n_fft)
+        speech_mask = (freqs >= 100) & (freqs <= 4000)
+        mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, dtype=y.dtype)
+
+        window = librosa.filters.get_window('hann', n_fft, fftbins=True).astype(y.dtype)[:, np.newaxis]
+        frames = librosa.util.frame(np.pad(y, n_fft // 2), frame_length=n_fft, hop_length=hop_length)
+        n_frames = frames.shape[1]
+
+        speech_total = np.zeros(np.count_nonzero(speech_mask))
+        mel = np.empty((mel_basis.shape[0], n_frames), dtype=y.dtype)
+        for start in range(0, n_frames, block_frames):
+            spectrum = scipy.fft.rfft(window * frames[:, start:start + block_frames], axis=0, workers=-1)
+            power = spectrum.real**2 + spectrum.imag**2
+            speech_total += np.sqrt(power[speech_mask]).sum(axis=1)
+            mel[:, start:start + block_frames] = mel_basis @ power
+
+        return {
+            'speech_freqs': freqs[speech_mask],
+            'speech_magnitude': speech_total / n_frames,
+            'onset_envelope': librosa.onset.onset_strength(
+                S=librosa.power_to_db(mel), sr=sr, n_fft=n_fft, hop_length=hop_length
+            ),
+        }
+
     def create_biological_hash(self):
         """Create deterministic hash from biological features"""
         if not self.biometric_data:
             return None
         
-        feature_string = ""
-        
-        # Convert all features to deterministic string
-        for domain, metrics in self.biometric_data.items():
-            for key, value in metrics.items():
-                if isinstance(value, (int, float)):
-                    feature_string += f"{domain}_{key}_{value:.6f}_"
+        # Convert all features to deterministic string (format and order are
+        # part of every published hash - do not change)
+        feature_string = "".join(
+            f"{domain}_{key}_{value:.6f}_"
+            for domain, metrics in self.biometric_data.items()
+            for key, value in metrics.items()
+            if isinstance(value, (int, float))
+        )
         
         biological_hash = hashlib.sha256(feature_string.encode()).hexdigest()
         
         return {
             'biological_hash': biological_hash,
-            'feature_digest': hashlib.sha256(feature_string.encode()).hexdigest()[:16],
+            'feature_digest': biological_hash[:16],
             'biometric_data': self.biometric_data,
             'confidence_score': self._calculate_confidence(),
             'timestamp': np.datetime64('now').astype(str)
@@ -214,12 +290,51 @@ class SovereignVoiceprint:
         
         return np.mean(confidence_factors) if confidence_factors else 0.5
 
-def create_voiceprint(audio_path, output_path=None):
+def _biometrics_cache_path(audio_path, sample_rate, pitch_tracker):
+    """Cache file for this audio content and extraction settings"""
+    digest = hashlib.sha256()
+    with open(audio_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return os.path.join(CACHE_DIR, f"{digest.hexdigest()}_{sample_rate}_{pitch_tracker}_v{CACHE_VERSION}.json")
+
+def _load_cached_biometrics(cache_path):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_biometrics(cache_path, biometrics):
+    # Write-then-rename so concurrent batch workers never see a partial file
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(biometrics, f)
+    os.replace(tmp_path, cache_path)
+
+def create_voiceprint(audio_path, output_path=None, pitch_tracker='pyin', use_cache=True):
     """Main function to create sovereign voiceprint"""
     print(f"🎤 Processing: {audio_path}")
     
-    vp = SovereignVoiceprint()
-    biometrics = vp.extract_universal_biometrics(audio_path)
+    vp = SovereignVoiceprint(pitch_tracker=pitch_tracker)
+    
+    cache_path = None
+    if use_cache:
+        try:
+            cache_path = _biometrics_cache_path(audio_path, vp.sr, pitch_tracker)
+        except OSError:
+            pass  # unreadable file; extraction reports the error
+    
+    biometrics = _load_cached_biometrics(cache_path) if cache_path else None
+    if biometrics:
+        print("♻️ Reusing cached biometrics")
+        vp.biometric_data = biometrics
+    else:
+        biometrics = vp.extract_universal_biometrics(audio_path)
+        # Don't cache a 'dio' request that fell back to pyin
+        if biometrics and cache_path and biometrics['cord_elasticity']['pitch_tracker'] == pitch_tracker:
+            _store_cached_biometrics(cache_path, biometrics)
     
     if biometrics:
         result = vp.create_biological_hash()
@@ -234,16 +349,37 @@ def create_voiceprint(audio_path, output_path=None):
         print("❌ Failed to extract voiceprint")
         return None
 
+def create_voiceprints_batch(audio_paths, output_paths=None, workers=None, pitch_tracker='pyin'):
+    """Create voiceprints for many files in parallel, one file per worker process"""
+    # Processes rather than threads: librosa holds the GIL for much of its work
+    if output_paths is None:
+        output_paths = [None] * len(audio_paths)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            create_voiceprint, audio_paths, output_paths, [pitch_tracker] * len(audio_paths)
+        ))
+
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python3 biological_core.py <audio_file>")
+    if len(sys.argv) < 2:
+        print("Usage: python3 biological_core.py <audio_file> [audio_file ...]")
         sys.exit(1)
     
-    audio_file = sys.argv[1]
-    output_file = f"proofs/voiceprint_{hashlib.md5(audio_file.encode()).hexdigest()[:8]}.json"
+    audio_files = sys.argv[1:]
+    output_files = [
+        f"proofs/voiceprint_{hashlib.md5(audio_file.encode()).hexdigest()[:8]}.json"
+        for audio_file in audio_files
+    ]
+    
+    if len(audio_files) == 1:
+        results = [create_voiceprint(audio_files[0], output_files[0])]
+    else:
+        results = create_voiceprints_batch(audio_files, output_files)
     
-    result = create_voiceprint(audio_file, output_file)
-    if result:
-        print(f"🎯 Biological Hash: {result['biological_hash']}")
-        print(f"📊 Confidence: {result['confidence_score']:.1%}")
+    for audio_file, result in zip(audio_files, results):
+        if result:
+            if len(audio_files) > 1:
+                print(f"🎤 {audio_file}")
+            print(f"🎯 Biological Hash: {result['biological_hash']}")
+            print(f"📊 Confidence: {result['confidence_score']:.1%}")
@@ -3,11 +3,14 @@
 Convergence test using your actual hashes from Artisan's Proof
 """
 
+import operator
+
 def hamming_distance(hash1, hash2):
     """Calculate similarity between two hashes"""
     if len(hash1) != len(hash2):
         return 1.0
-    return sum(c1 != c2 for c1, c2 in zip(hash1, hash2)) / len(hash1)
+    # Character-level, not bit-level: inputs aren't always hex (str(hash(...)))
+    return sum(map(operator.ne, hash1, hash2)) / len(hash1)
 
 def calculate_convergence(bio_hash, micro_hash, economic_pattern="3/97"):
     """Three-point sovereignty convergence"""
@@ -3,24 +3,16 @@ from web3 import Web3
 import os
 import json
 import time
+import sys
 
-def load_environment():
-    env_vars = {}
-    try:
-        with open('.anonymous_env', 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key] = value.strip('"\'')
-        return env_vars
-    except FileNotFoundError:
-        return {}
+# Add the repo root to path so we can import the shared env loader
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.envutil import load_environment
 
 def deploy_contract():
     env = load_environment()
-    ANON_PUBLIC_KEY = env.get('export ANON_PUBLIC_KEY', '').replace('export ', '')
-    ANON_PRIVATE_KEY = env.get('export ANON_PRIVATE_KEY', '').replace('export ', '')
+    ANON_PUBLIC_KEY = env.get('ANON_PUBLIC_KEY', '')
+    ANON_PRIVATE_KEY = env.get('ANON_PRIVATE_KEY', '')
     
     if not ANON_PUBLIC_KEY or not ANON_PRIVATE_KEY:
         print("❌ Could not load keys")
@@ -35,7 +27,13 @@ def deploy_contract():
     print(f"✅ Connected to Polygon")
     print(f"🚀 Deploying from: {ANON_PUBLIC_KEY}")
     
-    balance = w3.eth.get_balance(ANON_PUBLIC_KEY)
+    # Balance, gas price and nonce in a single JSON-RPC batch round trip
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.get_balance(ANON_PUBLIC_KEY))
+        batch.add(w3.eth.gas_price)
+        batch.add(w3.eth.get_transaction_count(ANON_PUBLIC_KEY))
+        balance, gas_price, nonce = batch.execute()
+    
     balance_matic = w3.from_wei(balance, 'ether')
     print(f"💰 Balance: {balance_matic:.4f} MATIC")
     
@@ -51,8 +49,8 @@ def deploy_contract():
             'to': ANON_PUBLIC_KEY,
             'value': 0,
             'gas': 50000,
-            'gasPrice': w3.eth.gas_price,
-            'nonce': w3.eth.get_transaction_count(ANON_PUBLIC_KEY),
+            'gasPrice': gas_price,
+            'nonce': nonce,
             'chainId': 137,
             'data': '0x' + 'SovereignAudioProtocolV1'.encode('utf-8').hex()
         }
@@ -2,27 +2,17 @@
 from web3 import Web3
 import os
 import json
+import sys
 
-def load_environment():
-    """Load environment variables"""
-    env_vars = {}
-    try:
-        with open('.anonymous_env', 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key] = value.strip('"\'')
-        return env_vars
-    except FileNotFoundError:
-        print("❌ .anonymous_env file not found")
-        return {}
+# Add the repo root to path so we can import the shared env loader
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.envutil import load_environment
 
 def deploy_contract():
     # Load environment
     env = load_environment()
-    ANON_PUBLIC_KEY = env.get('export ANON_PUBLIC_KEY', '').replace('export ', '')
-    ANON_PRIVATE_KEY = env.get('export ANON_PRIVATE_KEY', '').replace('export ', '')
+    ANON_PUBLIC_KEY = env.get('ANON_PUBLIC_KEY', '')
+    ANON_PRIVATE_KEY = env.get('ANON_PRIVATE_KEY', '')
     
     if not ANON_PUBLIC_KEY or not ANON_PRIVATE_KEY:
         print("❌ Could not load keys from .anonymous_env")
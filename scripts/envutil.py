@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Shared .anonymous_env loader for the deployment scripts
+"""
+
+import re
+
+# KEY=value lines, optionally prefixed with `export` (shell-sourceable files)
+_ASSIGNMENT = re.compile(r'^[ \t]*(?:export[ \t]+)?(\w+)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.M)
+
+def load_environment(path='.anonymous_env'):
+    """Load environment variables without external dependencies"""
+    try:
+        with open(path, 'r') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"❌ {path} file not found")
+        return {}
+    return {key: value.strip('"\'') for key, value in _ASSIGNMENT.findall(text)}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Fractal Core - Phase 3
+Shared midpoint-displacement fractal generation and phase shifting
+"""
+
+import hashlib
+import numpy as np
+import scipy.fft
+from functools import lru_cache
+
+def midpoint_displacement(rng, length):
+    """1-D midpoint-displacement fractal drawn from rng (RandomState or Generator)
+
+    Midpoints of one level only read points fixed by earlier levels, so each
+    level is a single vectorized update. Values are drawn in the same order
+    as a point-by-point loop, so a given RandomState reproduces the patterns
+    of the original scalar implementation bit for bit.
+    """
+    pattern = np.zeros(length)
+    pattern[0] = rng.uniform(-1, 1)
+    
+    step = length // 2
+    scale = 1.0
+    while step > 0:
+        idx = np.arange(step, length - step, step * 2)
+        pattern[idx] = (pattern[idx - step] + pattern[idx + step]) / 2
+        pattern[idx] += rng.uniform(-scale, scale, idx.size)
+        step //= 2
+        scale *= 0.5
+    return pattern
+
+def fractal_seed(seed):
+    """Stable 64-bit integer seed for a string seed
+
+    hash() of a str is salted per process (PYTHONHASHSEED), so patterns
+    seeded from it could not be regenerated by a later run.
+    """
+    return int.from_bytes(hashlib.sha256(seed.encode()).digest()[:8], 'little')
+
+@lru_cache(maxsize=32)
+def generate_fractal_pattern(seed, length):
+    """Generate fractal pattern from a string seed
+
+    Patterns are deterministic in (seed, length), so they are cached and
+    returned read-only; copy before modifying.
+    """
+    pattern = midpoint_displacement(np.random.default_rng(fractal_seed(seed)), length)
+    pattern.flags.writeable = False
+    return pattern
+
+@lru_cache(maxsize=4)
+def create_test_audio(duration_seconds=2, frequency=440):
+    """Half-amplitude test sine at 44.1 kHz, cached and returned read-only"""
+    sample_rate = 44100
+    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
+    audio = 0.5 * np.sin(2 * np.pi * frequency * t)
+    audio.flags.writeable = False
+    return audio
+
+@lru_cache(maxsize=None)
+def phase_multiplier(shift_samples, n):
+    """rfft-bin multiplier for a phase shift of shift_samples on an n-sample chunk
+
+    The encoders' full-spectrum ramp linspace(0, s*2pi/n, n) has slope
+    a = s*2pi/(n*(n-1)); keeping only the real part of its inverse folds it
+    onto the positive bins as exp(ia(k - n/2)) * cos(an/2), with DC
+    untouched. Same result as the complex fft/ifft round trip at half the
+    work - and not an integer roll of the chunk.
+    """
+    a = shift_samples * (2 * np.pi / (n * (n - 1)))
+    multiplier = np.exp(1j * a * (np.arange(n // 2 + 1) - n / 2)) * np.cos(a * n / 2)
+    multiplier[0] = 1
+    multiplier.flags.writeable = False
+    return multiplier
+
+def audio_dtype(audio):
+    """Working dtype for encoding: float32 audio stays float32, anything else is float64"""
+    return np.float32 if np.asarray(audio).dtype == np.float32 else float
+
+def apply_phase_shift(chunk, shift_samples):
+    """Apply inaudible phase shift to one chunk"""
+    if shift_samples == 0:
+        return chunk
+    n = len(chunk)
+    spectrum = scipy.fft.rfft(chunk)
+    spectrum *= phase_multiplier(int(shift_samples), n).astype(spectrum.dtype, copy=False)
+    return scipy.fft.irfft(spectrum, n=n)
+
+def apply_phase_shifts(frames, shifts, out=None, block_chunks=256):
+    """Batched apply_phase_shift over the rows of a (n_chunks, chunk_size) array
+
+    With out=frames the shifted rows are written back in place and
+    zero-shift rows are never copied. Rows go through the FFT in blocks of
+    block_chunks, so the complex temporaries stay a few MB however long the
+    audio is. float32 frames are shifted in single precision (complex64).
+    """
+    shifted = np.array(frames, dtype=audio_dtype(frames)) if out is None else out
+    rows = np.flatnonzero(shifts)
+    if rows.size:
+        n = frames.shape[1]
+        # Shifts are small integers, so a track needs only a handful of
+        # multipliers; gather rows from that bank instead of one exp() per chunk
+        unique_shifts, bank_idx = np.unique(shifts[rows], return_inverse=True)
+        bank = np.stack([phase_multiplier(int(shift), n) for shift in unique_shifts])
+        bank = bank.astype(np.complex64 if frames.dtype == np.float32 else complex, copy=False)
+        for start in range(0, rows.size, block_chunks):
+            block = rows[start:start + block_chunks]
+            freq_domain = scipy.fft.rfft(frames[block], axis=1, workers=-1)
+            freq_domain *= bank[bank_idx[start:start + block_chunks]]
+            shifted[block] = scipy.fft.irfft(freq_domain, n=n, axis=1, workers=-1)
+    return shifted
+
+def apply_time_shifts(frames, shifts, out=None, fade_length=0):
+    """Batched zero-filled time shift of the rows of a (n_chunks, chunk_size) array
+
+    Row r moves right by shifts[r] samples (left when negative); what is
+    shifted in from outside the chunk is zero, as with np.roll followed by
+    zeroing the wrapped samples. With fade_length, the first
+    min(fade_length, |shift|) shifted samples next to the zeroed edge ramp
+    linearly in from 0 so the edge does not click. Zero-shift rows are left
+    as is.
+    """
+    shifted = np.array(frames, dtype=float) if out is None else out
+    rows = np.flatnonzero(shifts)
+    if rows.size:
+        n = frames.shape[1]
+        row_shifts = shifts[rows, np.newaxis]
+        source = np.arange(n) - row_shifts
+        inside = (source >= 0) & (source < n)
+        moved = np.take_along_axis(frames[rows], np.clip(source, 0, n - 1), axis=1)
+        if fade_length:
+            # Distance of each sample from the zeroed edge, in fade steps
+            fade = np.minimum(fade_length, np.abs(row_shifts))
+            edge = np.where(row_shifts > 0, source, n - 1 - source)
+            moved *= np.clip(edge / np.maximum(fade - 1, 1), 0, 1)
+        shifted[rows] = np.where(inside, moved, 0)
+    return shifted
+
+def chunk_shifts(fractal_pattern, n_chunks, max_shift_ms, sample_rate=44100):
+    """Integer shift per chunk: the normalized pattern, cycled over the chunks"""
+    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
+    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
+    pattern_idx = np.arange(n_chunks) % len(fractal_norm)
+    return (fractal_norm[pattern_idx] * max_shift_samples).astype(int)
+
+def encode_phase_fractal(audio, fractal_pattern, max_shift_ms, chunk_size=2048):
+    """Encode audio with fractal phase shifts in one batched FFT over all whole chunks"""
+    # Float copy of the audio viewed as (n_chunks, chunk_size); the trailing
+    # partial chunk passes through unshifted
+    encoded_audio = np.array(audio, dtype=audio_dtype(audio))
+    n_chunks = len(encoded_audio) // chunk_size
+    frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    apply_phase_shifts(frames, chunk_shifts(fractal_pattern, n_chunks, max_shift_ms), out=frames)
+    return encoded_audio
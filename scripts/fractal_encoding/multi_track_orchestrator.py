@@ -6,6 +6,12 @@ Composite signature encoding for multiple audio tracks
 
 import numpy as np
 import soundfile as sf
+import os
+import sys
+
+# Add the repo root to path so we can import the shared fractal core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import apply_phase_shift, apply_phase_shifts, audio_dtype, chunk_shifts, generate_fractal_pattern
 
 class MultiTrackOrchestrator:
     def __init__(self):
@@ -16,13 +22,29 @@ class MultiTrackOrchestrator:
         fractal_family = self.generate_fractal_family(fractal_seed, len(audio_tracks))
         frequency_bands = ['low', 'mid', 'high']
         
+        # Every track's shifted chunks go through one batched FFT; scipy.fft
+        # spreads that across cores without pickling tracks to worker
+        # processes. Zero-shift chunks are left where they are.
         encoded_tracks = {}
+        track_frames = []
+        track_active = []
+        active_shifts = []
         
         for i, (track_name, audio) in enumerate(audio_tracks.items()):
-            encoded = self.encode_single_track(
-                audio, fractal_family[i], strengths[i], frequency_bands[i]
-            )
+            encoded, frames, shifts = self._frame_track(audio, fractal_family[i], strengths[i])
             encoded_tracks[track_name] = encoded
+            active = np.flatnonzero(shifts)
+            track_frames.append(frames)
+            track_active.append(active)
+            active_shifts.append(shifts[active])
+        
+        if track_frames:
+            shifted = np.concatenate([frames[active] for frames, active in zip(track_frames, track_active)])
+            self.apply_phase_shifts(shifted, np.concatenate(active_shifts), out=shifted)
+            offset = 0
+            for frames, active in zip(track_frames, track_active):
+                frames[active] = shifted[offset:offset + len(active)]
+                offset += len(active)
             
         return encoded_tracks
     
@@ -36,52 +58,34 @@ class MultiTrackOrchestrator:
     
     def generate_fractal_pattern(self, seed, length):
         """Generate deterministic fractal pattern"""
-        rng = np.random.RandomState(hash(seed) % 2**32)
-        pattern = np.zeros(length)
-        pattern[0] = rng.uniform(-1, 1)
-        
-        step = length // 2
-        scale = 1.0
-        while step > 0:
-            for i in range(step, length, step * 2):
-                if i + step < length:
-                    pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                    pattern[i] += rng.uniform(-scale, scale)
-            step //= 2
-            scale *= 0.5
-        return pattern
+        return generate_fractal_pattern(seed, length)
     
     def encode_single_track(self, audio, fractal_pattern, strength_ms, frequency_band):
         """Encode single track with phase shifts"""
-        sample_rate = 44100
-        max_shift_samples = int((strength_ms / 1000) * sample_rate)
-        fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
+        encoded_audio, frames, shifts = self._frame_track(audio, fractal_pattern, strength_ms)
+        self.apply_phase_shifts(frames, shifts, out=frames)
         
-        encoded_audio = []
+        return encoded_audio
+    
+    def _frame_track(self, audio, fractal_pattern, strength_ms):
+        """Float copy of the track, a (n_chunks, 2048) view of its whole chunks and their shifts"""
         chunk_size = 2048
         
-        for i in range(0, len(audio), chunk_size):
-            chunk = audio[i:i + chunk_size]
-            if len(chunk) == chunk_size:
-                pattern_idx = (i // chunk_size) % len(fractal_norm)
-                shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-                chunk = self.apply_phase_shift(chunk, shift_samples)
-            encoded_audio.extend(chunk)
+        # The trailing partial chunk is never shifted; float32 tracks stay float32
+        encoded_audio = np.array(audio, dtype=audio_dtype(audio))
+        n_chunks = len(encoded_audio) // chunk_size
+        frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+        shifts = chunk_shifts(fractal_pattern, n_chunks, strength_ms)
         
-        return np.array(encoded_audio)
+        return encoded_audio, frames, shifts
+    
+    def apply_phase_shifts(self, frames, shifts, out=None):
+        """Batched apply_phase_shift over the rows of a (n_chunks, chunk_size) array"""
+        return apply_phase_shifts(frames, shifts, out=out)
     
     def apply_phase_shift(self, chunk, shift_samples):
         """Apply inaudible phase shift"""
-        if shift_samples == 0:
-            return chunk
-        
-        freq_domain = np.fft.fft(chunk)
-        angles = np.angle(freq_domain)
-        phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-        new_angles = angles + phase_shift
-        
-        freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-        return np.real(np.fft.ifft(freq_domain_shifted))
+        return apply_phase_shift(chunk, shift_samples)
 
 if __name__ == "__main__":
     print("🎵 MULTI-TRACK ORCHESTRATOR - PHASE 3")
@@ -5,6 +5,12 @@ Inaudible sub-second audio protection (0.01ms shifts)
 """
 
 import numpy as np
+import os
+import sys
+
+# Add the repo root to path so we can import the shared fractal core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import apply_phase_shift, apply_phase_shifts, encode_phase_fractal
 
 class PhaseShiftEncoder:
     def __init__(self):
@@ -16,34 +22,15 @@ class PhaseShiftEncoder:
         if strength_ms is None:
             strength_ms = self.default_strength
             
-        sample_rate = 44100
-        max_shift_samples = int((strength_ms / 1000) * sample_rate)
-        fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-        
-        encoded_audio = []
-        
-        for i in range(0, len(audio_data), self.chunk_size):
-            chunk = audio_data[i:i + self.chunk_size]
-            if len(chunk) == self.chunk_size:
-                pattern_idx = (i // self.chunk_size) % len(fractal_norm)
-                shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-                chunk = self.apply_phase_shift(chunk, shift_samples)
-            encoded_audio.extend(chunk)
-        
-        return np.array(encoded_audio)
+        return encode_phase_fractal(audio_data, fractal_pattern, strength_ms, self.chunk_size)
+    
+    def apply_phase_shifts(self, frames, shifts, out=None):
+        """Batched apply_phase_shift over the rows of a (n_chunks, chunk_size) array"""
+        return apply_phase_shifts(frames, shifts, out=out)
     
     def apply_phase_shift(self, chunk, shift_samples):
         """Apply phase shift - proven inaudible at 0.01ms"""
-        if shift_samples == 0:
-            return chunk
-            
-        freq_domain = np.fft.fft(chunk)
-        angles = np.angle(freq_domain)
-        phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-        new_angles = angles + phase_shift
-        
-        freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-        return np.real(np.fft.ifft(freq_domain_shifted))
+        return apply_phase_shift(chunk, shift_samples)
     
     def verify_encoding(self, original, encoded, threshold=0.99):
         """Verify encoding is both detectable and preserved audio quality"""
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Signature Core - Phase 3
+Shared simulated signature and signature-to-seed feature extraction
+"""
+
+import hashlib
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Signature-like squiggle through the middle of a 400x200 canvas
+SIGNATURE_POINTS = [
+    (50, 100), (80, 90), (120, 110), (160, 85),
+    (200, 105), (240, 95), (280, 115), (320, 100), (350, 110)
+]
+
+def create_signature_like_image():
+    """Create a simulated signature since we don't have a real image"""
+    img = Image.new('L', (400, 200), color=255)  # White background
+    draw = ImageDraw.Draw(img)
+
+    for i in range(len(SIGNATURE_POINTS)-1):
+        draw.line([SIGNATURE_POINTS[i], SIGNATURE_POINTS[i+1]], fill=0, width=3)
+
+    # Add a signature flourish
+    draw.arc([330, 90, 370, 130], 0, 180, fill=0, width=2)
+    return img
+
+def signature_to_fractal_seed(signature_image):
+    """Convert signature image features to fractal seed"""
+    img_array = np.array(signature_image)
+
+    features = {}
+    ink_pixels = img_array < 128  # Threshold for "ink"
+
+    # Ink profiles are summed once and shared by density and balance
+    ink_bytes = ink_pixels.view(np.uint8)
+    vertical_profile = ink_bytes.sum(axis=1, dtype=np.int32)
+    horizontal_profile = ink_bytes.sum(axis=0, dtype=np.int32)
+    features['ink_density'] = np.sum(vertical_profile) / ink_pixels.size
+
+    features['vertical_center'] = np.argmax(vertical_profile) / len(vertical_profile)
+    features['horizontal_center'] = np.argmax(horizontal_profile) / len(horizontal_profile)
+    # Simulated; a real implementation would use drawing-speed timestamps.
+    # std/mean of the integer ink counts is sqrt(n*sum(h^2) - sum(h)^2) / sum(h),
+    # both sums exact from one sum and one dot product
+    counts = horizontal_profile.astype(np.int64)
+    ink_total = int(counts.sum())
+    spread = len(counts) * int(counts @ counts) - ink_total * ink_total
+    features['stroke_rhythm'] = np.float64(np.sqrt(spread) / ink_total)
+
+    # Create deterministic seed from features
+    feature_string = ''.join(f"{k}:{v:.6f}" for k, v in features.items())
+    seed = hashlib.sha256(feature_string.encode()).hexdigest()[:16]
+
+    return seed, features
@@ -8,6 +8,12 @@ import numpy as np
 import hashlib
 from PIL import Image
 import json
+import os
+import sys
+
+# Add the repo root to path so we can import the shared fractal core
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import midpoint_displacement
 
 class SovereignIdentityEngine:
     def __init__(self):
@@ -29,10 +35,16 @@ class SovereignIdentityEngine:
         """Extract unique signature characteristics"""
         ink_pixels = img_array < 128
         
+        # Ink profiles are summed once and shared by density and balance;
+        # summing the mask's bytes as uint8 into int32 skips the int64 path
+        ink_bytes = ink_pixels.view(np.uint8)
+        vertical_profile = ink_bytes.sum(axis=1, dtype=np.int32)
+        horizontal_profile = ink_bytes.sum(axis=0, dtype=np.int32)
+        
         features = {
-            'ink_density': np.sum(ink_pixels) / ink_pixels.size,
-            'vertical_balance': self.calculate_vertical_balance(ink_pixels),
-            'horizontal_balance': self.calculate_horizontal_balance(ink_pixels),
+            'ink_density': np.sum(vertical_profile) / ink_pixels.size,
+            'vertical_balance': self.calculate_vertical_balance(vertical_profile),
+            'horizontal_balance': self.calculate_horizontal_balance(horizontal_profile),
             'stroke_complexity': self.calculate_stroke_complexity(ink_pixels),
             'signature_entropy': self.calculate_entropy(img_array)
         }
@@ -47,24 +59,10 @@ class SovereignIdentityEngine:
     
     def generate_audio_fractal_pattern(self, fractal_seed, length=100):
         """Generate audio encoding pattern from fractal seed"""
-        # Use our proven fractal generation
+        # Use our proven fractal generation. Identity patterns are published,
+        # so this stays on the RandomState stream they were generated with
         rng = np.random.RandomState(int(fractal_seed[:8], 16) % (2**32))
-        
-        pattern = np.zeros(length)
-        pattern[0] = rng.uniform(-1, 1)
-        
-        step = length // 2
-        scale = 1.0
-        
-        while step > 0:
-            for i in range(step, length, step * 2):
-                if i + step < length:
-                    pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                    pattern[i] += rng.uniform(-scale, scale)
-            step //= 2
-            scale *= 0.5
-        
-        return pattern
+        return midpoint_displacement(rng, length)
     
     def create_sovereign_identity_package(self, signature_image, creator_address, sovereignty_path):
         """Create complete sovereign identity package"""
@@ -84,12 +82,10 @@ class SovereignIdentityEngine:
         return sovereign_id
     
     # Helper methods
-    def calculate_vertical_balance(self, ink_pixels):
-        vertical_profile = np.sum(ink_pixels, axis=1)
+    def calculate_vertical_balance(self, vertical_profile):
         return np.argmax(vertical_profile) / len(vertical_profile)
     
-    def calculate_horizontal_balance(self, ink_pixels):
-        horizontal_profile = np.sum(ink_pixels, axis=0)
+    def calculate_horizontal_balance(self, horizontal_profile):
         return np.argmax(horizontal_profile) / len(horizontal_profile)
     
     def calculate_stroke_complexity(self, ink_pixels):
@@ -98,6 +94,12 @@ class SovereignIdentityEngine:
         return num_features / ink_pixels.size
     
     def calculate_entropy(self, img_array):
+        if img_array.dtype.kind == 'u':
+            # Same value counts, in the same order, that skimage's
+            # shannon_entropy gets from np.unique - one pass, no sort
+            from scipy.stats import entropy
+            counts = np.bincount(img_array.ravel())
+            return float(entropy(counts[counts > 0], base=2))
         from skimage.measure import shannon_entropy
         return float(shannon_entropy(img_array))
     
@@ -7,24 +7,37 @@ Encrypted lyric diaries with version control
 import hashlib
 import json
 from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
+from Crypto.Util.Padding import unpad
+from Crypto.Random import get_random_bytes
 import base64
 
+# Lyric diaries are sealed with AES-256-GCM: CTR-mode blocks pipeline on
+# AES-NI (CBC encryption is serial) and the tag authenticates the image.
+# Blobs without this prefix are the original IV + AES-CBC format.
+GCM_FORMAT_PREFIX = b'APG1'
+
+# Attachment records name the format explicitly, so a legacy CBC blob whose
+# random IV happens to start with the prefix can still be decrypted
+ENCRYPTION_FORMAT_GCM = 'aes-256-gcm'
+ENCRYPTION_FORMAT_CBC = 'aes-256-cbc'
+
 class ImageAttachmentSystem:
     def __init__(self):
         print("📸 IMAGE ATTACHMENT SYSTEM - PHASE 3")
         
-    def encrypt_lyric_diary(self, image_path, fractal_seed):
-        """Encrypt image using fractal seed as key"""
+    def encrypt_lyric_diary(self, image_path, fractal_seed, out=None):
+        """Encrypt image using fractal seed as key
+
+        With out (a binary writer) the encrypted diary is streamed there and
+        None is returned in place of its bytes; see aes_encrypt_blocks.
+        """
         # Derive encryption key from fractal seed
         encryption_key = self.derive_encryption_key(fractal_seed)
         
-        # Read and encrypt image
+        # Read, encrypt and hash the image in one pass over 1 MB blocks
         with open(image_path, 'rb') as f:
-            image_data = f.read()
-        
-        encrypted_data = self.aes_encrypt(image_data, encryption_key)
-        content_hash = hashlib.sha256(encrypted_data).hexdigest()
+            blocks = iter(lambda: f.read(1 << 20), b'')
+            encrypted_data, content_hash = self.aes_encrypt_blocks(blocks, encryption_key, out)
         
         return encrypted_data, content_hash
     
@@ -35,11 +48,37 @@ class ImageAttachmentSystem:
         return hashlib.sha256(key_material).digest()
     
     def aes_encrypt(self, data, key):
-        """AES-256 encrypt data"""
-        cipher = AES.new(key, AES.MODE_CBC)
-        ct_bytes = cipher.encrypt(pad(data, AES.block_size))
-        iv = cipher.iv
-        return iv + ct_bytes
+        """AES-256-GCM encrypt data: prefix + nonce + ciphertext + tag"""
+        encrypted_data, _ = self.aes_encrypt_blocks([data], key)
+        return encrypted_data
+    
+    def aes_encrypt_blocks(self, blocks, key, out=None):
+        """aes_encrypt over an iterable of plaintext blocks, plus the SHA-256 of the result
+
+        With out, each piece of the blob is written to that binary writer as
+        it is produced and (None, hash) is returned, so only one block is
+        held at a time. Without it the pieces are collected and joined into
+        the returned bytes, which briefly needs about twice the blob's size.
+        """
+        nonce = get_random_bytes(12)
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        
+        parts = []
+        write = parts.append if out is None else out.write
+        
+        header = GCM_FORMAT_PREFIX + nonce
+        content_hash = hashlib.sha256(header)
+        write(header)
+        for block in blocks:
+            ct_bytes = cipher.encrypt(block)
+            content_hash.update(ct_bytes)
+            write(ct_bytes)
+        tag = cipher.digest()
+        content_hash.update(tag)
+        write(tag)
+        
+        encrypted_data = b''.join(parts) if out is None else None
+        return encrypted_data, content_hash.hexdigest()
     
     def create_attachment_record(self, encrypted_data, content_hash, attachment_type, description, previous_version=None):
         """Create attachment record for blockchain"""
@@ -49,19 +88,46 @@ class ImageAttachmentSystem:
             'description': description,
             'timestamp': self.current_timestamp(),
             'data_size': len(encrypted_data),
-            'previous_version': previous_version
+            'previous_version': previous_version,
+            'encryption_format': ENCRYPTION_FORMAT_GCM
         }
         
         return attachment
     
-    def decrypt_lyric_diary(self, encrypted_data, fractal_seed):
-        """Decrypt image using fractal seed"""
+    def decrypt_lyric_diary(self, encrypted_data, fractal_seed, encryption_format=None):
+        """Decrypt image using fractal seed
+
+        encryption_format is the attachment record's 'encryption_format';
+        records without one are told apart by the GCM prefix. A blob
+        decrypted as GCM that fails authentication always raises ValueError -
+        it never falls back to CBC, whose padding check would let roughly
+        1 in 256 tampered blobs through as garbage.
+        """
         encryption_key = self.derive_encryption_key(fractal_seed)
         
+        if encryption_format is None:
+            is_gcm = encrypted_data.startswith(GCM_FORMAT_PREFIX)
+        elif encryption_format in (ENCRYPTION_FORMAT_GCM, ENCRYPTION_FORMAT_CBC):
+            is_gcm = encryption_format == ENCRYPTION_FORMAT_GCM
+        else:
+            raise ValueError(f"Unknown encryption format: {encryption_format}")
+        
+        if not is_gcm:
+            return self.aes_cbc_decrypt(encrypted_data, encryption_key)
+        
+        if not encrypted_data.startswith(GCM_FORMAT_PREFIX):
+            raise ValueError("Not an AES-GCM lyric diary")
+        body = encrypted_data[len(GCM_FORMAT_PREFIX):]
+        nonce, ct, tag = body[:12], body[12:-16], body[-16:]
+        cipher = AES.new(encryption_key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(ct, tag)
+    
+    def aes_cbc_decrypt(self, encrypted_data, key):
+        """Decrypt the original IV + AES-256-CBC format"""
         iv = encrypted_data[:16]
         ct = encrypted_data[16:]
         
-        cipher = AES.new(encryption_key, AES.MODE_CBC, iv)
+        cipher = AES.new(key, AES.MODE_CBC, iv)
         pt = unpad(cipher.decrypt(ct), AES.block_size)
         
         return pt
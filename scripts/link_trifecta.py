@@ -1,37 +1,35 @@
 #!/usr/bin/env python3
 import json
 import hashlib
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 import os
 import time
+import sys
 
-def load_environment():
-    env_vars = {}
-    try:
-        with open('.anonymous_env', 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key] = value.strip('"\'')
-        return env_vars
-    except FileNotFoundError:
-        return {}
+# Add the repo root to path so we can import the shared env loader
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.envutil import load_environment
 
 def link_all_proofs():
     """Link all three proofs in one efficient blockchain transaction"""
     
     # Load your anonymous identity
     env = load_environment()
-    ANON_PUBLIC_KEY = env.get('export ANON_PUBLIC_KEY', '').replace('export ', '')
-    ANON_PRIVATE_KEY = env.get('export ANON_PRIVATE_KEY', '').replace('export ', '')
+    ANON_PUBLIC_KEY = env.get('ANON_PUBLIC_KEY', '')
+    ANON_PRIVATE_KEY = env.get('ANON_PRIVATE_KEY', '')
     
     if not ANON_PUBLIC_KEY or not ANON_PRIVATE_KEY:
         print("❌ Could not load keys")
         return
     
-    # Connect to Polygon (simpler connection without POA middleware)
-    w3 = Web3(Web3.HTTPProvider('https://polygon-rpc.com'))
+    # Connect to Polygon (simpler connection without POA middleware), keeping
+    # one pooled keep-alive session for every RPC call of the linkage
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    w3 = Web3(Web3.HTTPProvider('https://polygon-rpc.com', session=session,
+                                request_kwargs={'timeout': 10}))
     
     if not w3.is_connected():
         print("❌ Cannot connect to Polygon")
@@ -63,12 +61,18 @@ def link_all_proofs():
     
     # Create on-chain transaction
     try:
+        # Gas price and nonce in a single JSON-RPC batch round trip
+        with w3.batch_requests() as batch:
+            batch.add(w3.eth.gas_price)
+            batch.add(w3.eth.get_transaction_count(ANON_PUBLIC_KEY))
+            gas_price, nonce = batch.execute()
+        
         transaction = {
             'to': ANON_PUBLIC_KEY,
             'value': 0,
             'gas': 100000,
-            'gasPrice': w3.eth.gas_price,
-            'nonce': w3.eth.get_transaction_count(ANON_PUBLIC_KEY),
+            'gasPrice': gas_price,
+            'nonce': nonce,
             'chainId': 137,
             'data': '0x' + master_hash[:56].encode('utf-8').hex()  # Store partial hash
         }
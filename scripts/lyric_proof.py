@@ -3,6 +3,7 @@ import hashlib
 import json
 import time
 from datetime import datetime
+from collections import Counter
 import os
 
 class LyricProof:
@@ -46,27 +47,26 @@ class LyricProof:
     def _analyze_lyric_structure(self, lyrics):
         """Analyze lyric structure patterns"""
         lines = lyrics.split('\n')
+        line_counts = Counter(lines)
         
-        structural_features = []
-        
-        for i, line in enumerate(lines):
-            line_features = {
-                'line_number': i,
-                'length': len(line),
-                'word_count': len(line.split()),
-                'ends_with_rhyme': line[-1] if line else '',  # Simple rhyme marker
-                'is_chorus_like': self._is_chorus_like(line, lines)
-            }
-            structural_features.append(str(line_features))
+        # Each entry is the str() of the per-line feature dict the published
+        # structure hashes were computed over; format it directly
+        structural_features = [
+            f"{{'line_number': {i}, 'length': {len(line)}, "
+            f"'word_count': {len(line.split())}, "
+            f"'ends_with_rhyme': {line[-1:]!r}, "  # Simple rhyme marker
+            f"'is_chorus_like': {self._is_chorus_like(line, line_counts)}}}"
+            for i, line in enumerate(lines)
+        ]
         
         structure_string = '|'.join(structural_features)
         return hashlib.sha256(structure_string.encode()).hexdigest()
     
-    def _is_chorus_like(self, line, all_lines):
+    def _is_chorus_like(self, line, line_counts):
         """Simple chorus detection (repeated lines)"""
         if not line:
             return False
-        return all_lines.count(line) > 1
+        return line_counts[line] > 1
     
     def create_complete_lyric_proof(self, lyric_text, song_title, artist_name, output_dir="proofs"):
         """Complete lyric proof creation"""
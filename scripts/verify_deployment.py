@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 from web3 import Web3
 import json
+import requests
+from concurrent.futures import ThreadPoolExecutor
 
 # Multiple Polygon RPC endpoints
 endpoints = [
@@ -10,26 +12,39 @@ endpoints = [
     'https://1rpc.io/matic'
 ]
 
+def _check(endpoint, tx_hash):
+    """Query one endpoint for the receipt; returns the lines to print for it"""
+    try:
+        # One keep-alive session per endpoint, reused for every call below
+        with requests.Session() as session:
+            w3 = Web3(Web3.HTTPProvider(endpoint, session=session,
+                                        request_kwargs={'timeout': 10}))
+            if not w3.is_connected():
+                return [f"❌ {endpoint} - Connection failed"]
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+            if receipt and receipt.blockNumber:
+                return [
+                    f"✅ {endpoint}",
+                    f"   Block: {receipt.blockNumber}",
+                    f"   Status: {'Success' if receipt.status == 1 else 'Failed'}",
+                    f"   Confirmations: {w3.eth.block_number - receipt.blockNumber}",
+                ]
+            return [f"❌ {endpoint} - Transaction not found"]
+    except Exception as e:
+        return [f"❌ {endpoint} - Error: {e}"]
+
 def verify_transaction(tx_hash):
     print(f"🔍 Verifying transaction: {tx_hash}")
     print("=" * 50)
     
-    for endpoint in endpoints:
-        try:
-            w3 = Web3(Web3.HTTPProvider(endpoint))
-            if w3.is_connected():
-                receipt = w3.eth.get_transaction_receipt(tx_hash)
-                if receipt and receipt.blockNumber:
-                    print(f"✅ {endpoint}")
-                    print(f"   Block: {receipt.blockNumber}")
-                    print(f"   Status: {'Success' if receipt.status == 1 else 'Failed'}")
-                    print(f"   Confirmations: {w3.eth.block_number - receipt.blockNumber}")
-                else:
-                    print(f"❌ {endpoint} - Transaction not found")
-            else:
-                print(f"❌ {endpoint} - Connection failed")
-        except Exception as e:
-            print(f"❌ {endpoint} - Error: {e}")
+    # Each check is one or two HTTPS round-trips, so query all endpoints at
+    # once and print the results in endpoint order
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        results = list(executor.map(lambda endpoint: _check(endpoint, tx_hash), endpoints))
+    
+    for lines in results:
+        for line in lines:
+            print(line)
         print()
 
 # Load the deployment proof
@@ -7,66 +7,24 @@ import numpy as np
 import soundfile as sf
 import subprocess
 import time
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_phase_shift(chunk, shift_samples):
-    """Phase shift - no crackles"""
-    if shift_samples == 0:
-        return chunk
-    freq_domain = np.fft.fft(chunk)
-    angles = np.angle(freq_domain)
-    phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-    new_angles = angles + phase_shift
-    freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-    return np.real(np.fft.ifft(freq_domain_shifted))
-
-def encode_phase_fractal(audio, fractal_pattern, max_shift_ms):
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
-    encoded_audio = []
-    chunk_size = 2048
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            chunk = apply_phase_shift(chunk, shift_samples)
-        encoded_audio.extend(chunk)
-    return np.array(encoded_audio)
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import create_test_audio, encode_phase_fractal, generate_fractal_pattern
 
 def detect_fractal_pattern(original, encoded, fractal_pattern, chunk_size=2048):
     """How well can we detect the fractal encoding?"""
-    correlations = []
-    for i in range(0, min(len(original), len(encoded)), chunk_size):
-        orig_chunk = original[i:i + chunk_size]
-        enc_chunk = encoded[i:i + chunk_size]
-        if len(orig_chunk) == chunk_size and len(enc_chunk) == chunk_size:
-            corr = np.corrcoef(orig_chunk, enc_chunk)[0,1]
-            correlations.append(corr)
+    # Pearson correlation of every whole chunk pair at once
+    n_chunks = min(len(original), len(encoded)) // chunk_size
+    orig_chunks = np.reshape(original[:n_chunks * chunk_size], (n_chunks, chunk_size))
+    enc_chunks = np.reshape(encoded[:n_chunks * chunk_size], (n_chunks, chunk_size))
+    a = orig_chunks - orig_chunks.mean(axis=1, keepdims=True)
+    b = enc_chunks - enc_chunks.mean(axis=1, keepdims=True)
+    correlations = np.einsum('ij,ij->i', a, b) / np.sqrt(np.einsum('ij,ij->i', a, a) * np.einsum('ij,ij->i', b, b))
     return np.mean(correlations), np.std(correlations)
 
-def create_test_audio(duration_seconds=2, frequency=440):
-    sample_rate = 44100
-    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
-    return 0.5 * np.sin(2 * np.pi * frequency * t)
-
 def play_file(filename, description):
     print(f"🎵 {description}")
     try:
@@ -6,6 +6,14 @@ Multi-Track Fractal Orchestra - Testing interactive encoding
 import numpy as np
 import soundfile as sf
 import matplotlib.pyplot as plt
+import scipy.fft
+from functools import lru_cache
+import os
+import sys
+
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import audio_dtype, chunk_shifts, generate_fractal_pattern
 
 def generate_fractal_family(master_seed, count=3):
     """Generate related but distinct fractal patterns"""
@@ -15,31 +23,10 @@ def generate_fractal_family(master_seed, count=3):
         patterns.append(generate_fractal_pattern(seed, 100))
     return patterns
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_complementary_phase_shift(chunk, shift_samples, frequency_band):
-    """Apply phase shift optimized for specific frequency band"""
-    if shift_samples == 0: 
-        return chunk
-    
-    freq_domain = np.fft.fft(chunk)
-    angles = np.angle(freq_domain)
-    
-    # Create frequency-dependent phase shift
-    freqs = np.fft.fftfreq(len(chunk))
+@lru_cache(maxsize=None)
+def band_phase_ramp(chunk_size, frequency_band):
+    """Per-bin phase shift for one sample of shift, emphasizing one frequency band"""
+    freqs = np.fft.fftfreq(chunk_size)
     if frequency_band == 'low':
         # Emphasize low frequencies (voice/box)
         band_weight = np.exp(-freqs**2 * 1000)
@@ -50,11 +37,30 @@ def apply_complementary_phase_shift(chunk, shift_samples, frequency_band):
         # Emphasize high frequencies (pennies)
         band_weight = np.exp(-(freqs-0.3)**2 * 5000)
     
-    phase_shift = band_weight * shift_samples * 2 * np.pi / len(chunk)
-    new_angles = angles + phase_shift
+    ramp = band_weight * 2 * np.pi / chunk_size
+    ramp.flags.writeable = False
+    return ramp
+
+def band_phase_multiplier(shift_samples, chunk_size, frequency_band):
+    """rfft-bin multipliers for band-weighted phase shifts of real chunks
+
+    The shift is applied to the full spectrum and only the real part of the
+    inverse kept; for real input that folds onto rfft bin k as the mean of
+    exp(i*phase[k]) and exp(-i*phase[-k]). Broadcasts over an array of shifts.
+    """
+    phase = np.multiply.outer(shift_samples, band_phase_ramp(chunk_size, frequency_band))
+    bins = np.arange(chunk_size // 2 + 1)
+    return (np.exp(1j * phase[..., bins]) + np.exp(-1j * phase[..., -bins % chunk_size])) / 2
+
+def apply_complementary_phase_shift(chunk, shift_samples, frequency_band):
+    """Apply phase shift optimized for specific frequency band"""
+    if shift_samples == 0: 
+        return chunk
     
-    freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-    return np.real(np.fft.ifft(freq_domain_shifted))
+    n = len(chunk)
+    spectrum = scipy.fft.rfft(chunk)
+    spectrum *= band_phase_multiplier(shift_samples, n, frequency_band).astype(spectrum.dtype, copy=False)
+    return scipy.fft.irfft(spectrum, n=n)
 
 def encode_multi_track(audio_tracks, master_seed, strengths):
     """Encode multiple tracks with complementary fractals"""
@@ -62,19 +68,23 @@ def encode_multi_track(audio_tracks, master_seed, strengths):
     frequency_bands = ['low', 'mid', 'high']  # Voice, Box, Pennies
     
     encoded_tracks = {}
-    interaction_signatures = []
+    track_frames = []
+    track_rows = []
+    multipliers = []
     
     for i, (track_name, audio) in enumerate(audio_tracks.items()):
         print(f"🔧 Encoding {track_name} with {frequency_bands[i]} band fractal...")
         
-        encoded = encode_single_track(
-            audio, 
-            fractal_family[i], 
-            strengths[i], 
-            frequency_bands[i]
-        )
+        encoded, frames, shifts = frame_track(audio, fractal_family[i], strengths[i])
+        rows = np.flatnonzero(shifts)
         encoded_tracks[track_name] = encoded
-        interaction_signatures.append(analyze_track_signature(encoded))
+        track_frames.append(frames)
+        track_rows.append(rows)
+        multipliers.append(band_phase_multiplier(shifts[rows], frames.shape[1], frequency_bands[i]))
+    
+    # Every track's shifted chunks go through one batched FFT
+    apply_band_shifts(track_frames, track_rows, multipliers)
+    interaction_signatures = [analyze_track_signature(encoded) for encoded in encoded_tracks.values()]
     
     # Create composite signature from interactions
     composite_signature = generate_composite_signature(interaction_signatures)
@@ -83,44 +93,57 @@ def encode_multi_track(audio_tracks, master_seed, strengths):
 
 def encode_single_track(audio, fractal_pattern, strength_ms, frequency_band):
     """Encode a single track with band-optimized phase shifts"""
-    sample_rate = 44100
-    max_shift_samples = int((strength_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
-    encoded_audio = []
-    chunk_size = 2048
-    
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            
-            chunk = apply_complementary_phase_shift(chunk, shift_samples, frequency_band)
-        encoded_audio.extend(chunk)
-    
-    return np.array(encoded_audio)
+    encoded_audio, frames, shifts = frame_track(audio, fractal_pattern, strength_ms)
+    rows = np.flatnonzero(shifts)
+    multiplier = band_phase_multiplier(shifts[rows], frames.shape[1], frequency_band)
+    apply_band_shifts([frames], [rows], [multiplier])
+    
+    return encoded_audio
+
+def frame_track(audio, fractal_pattern, strength_ms, chunk_size=2048):
+    """Float copy of the track, a (n_chunks, chunk_size) view of its whole chunks and their shifts"""
+    # The trailing partial chunk is never shifted. float32 tracks stay
+    # float32 (complex64 FFTs); anything else is encoded in float64
+    encoded_audio = np.array(audio, dtype=audio_dtype(audio))
+    n_chunks = len(encoded_audio) // chunk_size
+    frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    shifts = chunk_shifts(fractal_pattern, n_chunks, strength_ms)
+    
+    return encoded_audio, frames, shifts
+
+def apply_band_shifts(track_frames, track_rows, multipliers):
+    """Shift the given rows of each track's frames in place with one rfft/irfft over all of them"""
+    if not track_frames:
+        return
+    
+    chunk_size = track_frames[0].shape[1]
+    batch = np.concatenate([frames[rows] for frames, rows in zip(track_frames, track_rows)])
+    spectrum = scipy.fft.rfft(batch, axis=1, workers=-1)
+    spectrum *= np.concatenate(multipliers).astype(spectrum.dtype, copy=False)
+    shifted = scipy.fft.irfft(spectrum, n=chunk_size, axis=1, workers=-1)
+    
+    offset = 0
+    for frames, rows in zip(track_frames, track_rows):
+        frames[rows] = shifted[offset:offset + len(rows)]
+        offset += len(rows)
 
 def analyze_track_signature(audio):
     """Analyze the unique signature of each encoded track"""
     chunk_size = 1024
-    signatures = []
     
-    for i in range(0, len(audio), chunk_size):
-        if i + chunk_size <= len(audio):
-            chunk = audio[i:i + chunk_size]
-            # Analyze spectral characteristics
-            spectrum = np.abs(np.fft.fft(chunk))
-            signatures.append(spectrum[:chunk_size//2])  # Keep positive frequencies
+    # Analyze spectral characteristics of every whole chunk in one real FFT
+    n_chunks = len(audio) // chunk_size
+    chunks = np.reshape(audio[:n_chunks * chunk_size], (n_chunks, chunk_size))
+    spectra = np.abs(scipy.fft.rfft(chunks, axis=1, workers=-1))
     
-    return np.mean(signatures, axis=0)
+    # Keep positive frequencies; the average is accumulated in float64
+    return spectra[:, :chunk_size//2].mean(axis=0, dtype=np.float64)
 
 def generate_composite_signature(signatures):
     """Generate composite signature from track interactions"""
     # The composite is the unique pattern of how tracks interact
-    composite = np.ones_like(signatures[0])
-    for sig in signatures:
-        composite *= (1 + sig / np.max(sig))  # Multiplicative interaction
+    stacked = np.stack(signatures)
+    composite = np.prod(1 + stacked / stacked.max(axis=1, keepdims=True), axis=0)  # Multiplicative interaction
     return composite / np.max(composite)
 
 def create_multi_track_audio():
@@ -144,26 +167,39 @@ def create_multi_track_audio():
                0.15 * np.sin(2 * np.pi * 4000 * t) +
                0.1 * np.random.normal(0, 0.1, len(t)))  # Noise for metallic texture
     
+    # Single precision is plenty for 44.1 kHz audio and halves the bytes
+    # every FFT pass moves
     return {
-        'voice': voice,
-        'box': box, 
-        'pennies': pennies
+        'voice': voice.astype(np.float32),
+        'box': box.astype(np.float32), 
+        'pennies': pennies.astype(np.float32)
     }
 
-def verify_composite_signature(encoded_tracks, expected_composite, threshold=0.8):
-    """Verify the composite signature exists in the mixed audio"""
-    # Mix down to stereo (simulating final master)
-    mixed = np.zeros_like(encoded_tracks['voice'])
-    for track in encoded_tracks.values():
+def mix_down(encoded_tracks):
+    """Mix down to one buffer (simulating final master), accumulating in place"""
+    tracks = iter(encoded_tracks.values())
+    mixed = np.array(next(tracks), dtype=float)
+    for track in tracks:
         mixed += track
     
     mixed /= len(encoded_tracks)  # Normalize
+    return mixed
+
+def pearson(a, b):
+    """Pearson correlation of two 1-D signals, in float64 like np.corrcoef"""
+    a = np.asarray(a, dtype=np.float64) - np.mean(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64) - np.mean(b, dtype=np.float64)
+    return (a @ b) / np.sqrt((a @ a) * (b @ b))
+
+def verify_composite_signature(encoded_tracks, expected_composite, threshold=0.8):
+    """Verify the composite signature exists in the mixed audio"""
+    mixed = mix_down(encoded_tracks)
     
     # Analyze mixed signature
     mixed_signature = analyze_track_signature(mixed)
     
     # Compare to expected composite
-    correlation = np.corrcoef(mixed_signature, expected_composite)[0,1]
+    correlation = pearson(mixed_signature, expected_composite)
     
     return correlation, correlation > threshold
 
@@ -194,7 +230,7 @@ print(f"   Detected: {'✅ YES' if composite_detected else '❌ NO'}")
 print(f"\n🔍 INDIVIDUAL TRACK DETECTION:")
 for i, (track_name, audio) in enumerate(encoded_tracks.items()):
     original = tracks[track_name]
-    correlation = np.corrcoef(original, audio)[0,1]
+    correlation = pearson(original, audio)
     print(f"   {track_name:8} | Correlation: {correlation:.6f}")
 
 # Save individual tracks and mix
@@ -205,7 +241,7 @@ for track_name, audio in encoded_tracks.items():
     print(f"   {filename}")
 
 # Save mixed version (final master)
-mixed = sum(encoded_tracks.values()) / len(encoded_tracks)
+mixed = mix_down(encoded_tracks)
 sf.write('tests/fractal_encoding/multi_mixed.wav', mixed, 44100)
 print(f"   tests/fractal_encoding/multi_mixed.wav")
 
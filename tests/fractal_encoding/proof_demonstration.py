@@ -6,45 +6,13 @@ PROOF DEMONSTRATION - See and hear the encoding
 import numpy as np
 import soundfile as sf
 import matplotlib.pyplot as plt
+import scipy.fft
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_phase_shift(chunk, shift_samples):
-    if shift_samples == 0: return chunk
-    freq_domain = np.fft.fft(chunk)
-    angles = np.angle(freq_domain)
-    phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-    new_angles = angles + phase_shift
-    freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-    return np.real(np.fft.ifft(freq_domain_shifted))
-
-def encode_phase_fractal(audio, fractal_pattern, max_shift_ms):
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    encoded_audio = []
-    chunk_size = 2048
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            chunk = apply_phase_shift(chunk, shift_samples)
-        encoded_audio.extend(chunk)
-    return np.array(encoded_audio)
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import encode_phase_fractal, generate_fractal_pattern
 
 # Create test audio with clear visual signature
 sample_rate = 44100
@@ -79,12 +47,14 @@ plt.ylabel('Amplitude × 1000')
 plt.grid(True)
 
 # Plot 3: Frequency Domain
+# Both signals are real, so one rfft each covers the positive frequencies
+# for the magnitude and phase plots
 plt.subplot(2, 2, 3)
-freq_original = np.abs(np.fft.fft(original_audio))
-freq_encoded = np.abs(np.fft.fft(encoded_audio))
-freqs = np.fft.fftfreq(len(original_audio), 1/sample_rate)
-plt.semilogy(freqs[:len(freqs)//2], freq_original[:len(freqs)//2], 'b-', label='Original', alpha=0.7)
-plt.semilogy(freqs[:len(freqs)//2], freq_encoded[:len(freqs)//2], 'r-', label='Encoded', alpha=0.7)
+spectrum_original = scipy.fft.rfft(original_audio)
+spectrum_encoded = scipy.fft.rfft(encoded_audio)
+freqs = scipy.fft.rfftfreq(len(original_audio), 1/sample_rate)
+plt.semilogy(freqs, np.abs(spectrum_original), 'b-', label='Original', alpha=0.7)
+plt.semilogy(freqs, np.abs(spectrum_encoded), 'r-', label='Encoded', alpha=0.7)
 plt.title('Frequency Domain')
 plt.xlabel('Frequency (Hz)')
 plt.ylabel('Magnitude')
@@ -93,10 +63,8 @@ plt.grid(True)
 
 # Plot 4: Phase Differences
 plt.subplot(2, 2, 4)
-phase_original = np.angle(np.fft.fft(original_audio))
-phase_encoded = np.angle(np.fft.fft(encoded_audio))
-phase_diff = np.abs(phase_encoded - phase_original)
-plt.plot(freqs[:len(freqs)//2], phase_diff[:len(freqs)//2], 'purple')
+phase_diff = np.abs(np.angle(spectrum_encoded) - np.angle(spectrum_original))
+plt.plot(freqs, phase_diff, 'purple')
 plt.title('Phase Differences (The Fractal Signature)')
 plt.xlabel('Frequency (Hz)')
 plt.ylabel('Phase Difference (radians)')
@@ -4,45 +4,15 @@ Signature to Visual Fractal - SIMPLE and ROBUST version
 """
 
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only ever saved to PNG
 import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw
-import hashlib
+import os
+import sys
 
-def create_signature_like_image():
-    """Create a simulated signature"""
-    img = Image.new('L', (400, 200), color=255)
-    draw = ImageDraw.Draw(img)
-    
-    points = [
-        (50, 100), (80, 90), (120, 110), (160, 85), 
-        (200, 105), (240, 95), (280, 115), (320, 100), (350, 110)
-    ]
-    
-    for i in range(len(points)-1):
-        draw.line([points[i], points[i+1]], fill=0, width=3)
-    
-    draw.arc([330, 90, 370, 130], 0, 180, fill=0, width=2)
-    return img
-
-def signature_to_fractal_seed(signature_image):
-    """Convert signature image features to fractal seed"""
-    img_array = np.array(signature_image)
-    
-    features = {}
-    ink_pixels = img_array < 128
-    features['ink_density'] = np.sum(ink_pixels) / ink_pixels.size
-    
-    vertical_profile = np.sum(ink_pixels, axis=1)
-    horizontal_profile = np.sum(ink_pixels, axis=0)
-    
-    features['vertical_center'] = np.argmax(vertical_profile) / len(vertical_profile)
-    features['horizontal_center'] = np.argmax(horizontal_profile) / len(horizontal_profile)
-    features['stroke_rhythm'] = np.std(horizontal_profile) / np.mean(horizontal_profile)
-    
-    feature_string = ''.join(f"{k}:{v:.6f}" for k, v in features.items())
-    seed = hashlib.sha256(feature_string.encode()).hexdigest()[:16]
-    
-    return seed, features
+# Shared signature helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.signature_core import create_signature_like_image, signature_to_fractal_seed
 
 def generate_simple_fractal(seed, size=100):
     """Generate a simple but unique visual fractal from seed"""
@@ -4,59 +4,15 @@ Signature to Visual Fractal - Showing the transformation
 """
 
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only ever saved to PNG
 import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw
-import hashlib
+import os
+import sys
 
-def create_signature_like_image():
-    """Create a simulated signature since we don't have a real image"""
-    # Create a canvas
-    img = Image.new('L', (400, 200), color=255)  # White background
-    draw = ImageDraw.Draw(img)
-    
-    # Draw a signature-like squiggle
-    points = [
-        (50, 100), (80, 90), (120, 110), (160, 85), 
-        (200, 105), (240, 95), (280, 115), (320, 100), (350, 110)
-    ]
-    
-    # Draw the signature path
-    for i in range(len(points)-1):
-        draw.line([points[i], points[i+1]], fill=0, width=3)
-    
-    # Add some signature flourishes
-    draw.arc([330, 90, 370, 130], 0, 180, fill=0, width=2)
-    
-    return img
-
-def signature_to_fractal_seed(signature_image):
-    """Convert signature image features to fractal seed"""
-    # Convert to numpy array
-    img_array = np.array(signature_image)
-    
-    # Analyze signature features
-    features = {}
-    
-    # 1. Analyze ink distribution (where the signature is dense)
-    ink_pixels = img_array < 128  # Threshold for "ink"
-    features['ink_density'] = np.sum(ink_pixels) / ink_pixels.size
-    
-    # 2. Analyze vertical/horizontal distribution
-    vertical_profile = np.sum(ink_pixels, axis=1)
-    horizontal_profile = np.sum(ink_pixels, axis=0)
-    
-    features['vertical_center'] = np.argmax(vertical_profile) / len(vertical_profile)
-    features['horizontal_center'] = np.argmax(horizontal_profile) / len(horizontal_profile)
-    
-    # 3. Analyze stroke rhythm (simulated)
-    # In real implementation, this would analyze drawing speed from timestamp data
-    features['stroke_rhythm'] = np.std(horizontal_profile) / np.mean(horizontal_profile)
-    
-    # Create deterministic seed from features
-    feature_string = ''.join(f"{k}:{v:.6f}" for k, v in features.items())
-    seed = hashlib.sha256(feature_string.encode()).hexdigest()[:16]
-    
-    return seed, features
+# Shared signature helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.signature_core import create_signature_like_image, signature_to_fractal_seed
 
 def generate_visual_fractal(seed, size=400):
     """Generate a visual fractal from seed"""
@@ -71,27 +27,36 @@ def generate_visual_fractal(seed, size=400):
     scale = 1.0
     
     while step > 0:
+        # Each step only reads points fixed by earlier steps, so it is one
+        # vectorized update; noise is drawn in row-major loop order. As in the
+        # 1-D generator, only points whose neighbors lie inside the grid are
+        # displaced.
+        
         # Diamond step
-        for i in range(step, pattern_size, step * 2):
-            for j in range(step, pattern_size, step * 2):
-                pattern[i, j] = (pattern[i-step, j-step] + 
-                                pattern[i-step, j+step] + 
-                                pattern[i+step, j-step] + 
-                                pattern[i+step, j+step]) / 4
-                pattern[i, j] += rng.uniform(-scale, scale)
+        centers = np.arange(step, pattern_size - step, step * 2)
+        ci, cj = np.ix_(centers, centers)
+        pattern[ci, cj] = (pattern[ci-step, cj-step] + 
+                           pattern[ci-step, cj+step] + 
+                           pattern[ci+step, cj-step] + 
+                           pattern[ci+step, cj+step]) / 4
+        pattern[ci, cj] += rng.uniform(-scale, scale, (centers.size, centers.size))
+        
+        # Square step: average of the in-bounds edge neighbors
+        grid = np.arange(0, pattern_size, step)
+        gi, gj = np.meshgrid(grid, grid, indexing='ij')
+        odd = (gi // step + gj // step) % 2 == 1
+        i, j = gi[odd], gj[odd]
+        total = np.zeros(i.size)
+        count = np.zeros(i.size)
+        for di, dj in ((-step, 0), (step, 0), (0, -step), (0, step)):
+            ni, nj = i + di, j + dj
+            inside = (ni >= 0) & (ni < pattern_size) & (nj >= 0) & (nj < pattern_size)
+            total[inside] += pattern[ni[inside], nj[inside]]
+            count += inside
         
-        # Square step  
-        for i in range(0, pattern_size, step):
-            for j in range(0, pattern_size, step):
-                if (i // step + j // step) % 2 == 1:
-                    neighbors = []
-                    if i > 0: neighbors.append(pattern[i-step, j])
-                    if i < pattern_size-1: neighbors.append(pattern[i+step, j])
-                    if j > 0: neighbors.append(pattern[i, j-step])
-                    if j < pattern_size-1: neighbors.append(pattern[i, j+step])
-                    
-                    if neighbors:
-                        pattern[i, j] = np.mean(neighbors) + rng.uniform(-scale, scale)
+        has_neighbors = count > 0
+        i, j = i[has_neighbors], j[has_neighbors]
+        pattern[i, j] = total[has_neighbors] / count[has_neighbors] + rng.uniform(-scale, scale, i.size)
         
         step //= 2
         scale *= 0.5
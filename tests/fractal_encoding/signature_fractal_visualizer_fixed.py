@@ -4,45 +4,15 @@ Signature to Visual Fractal - Fixed version
 """
 
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only ever saved to PNG
 import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw
-import hashlib
+import os
+import sys
 
-def create_signature_like_image():
-    """Create a simulated signature since we don't have a real image"""
-    img = Image.new('L', (400, 200), color=255)
-    draw = ImageDraw.Draw(img)
-    
-    points = [
-        (50, 100), (80, 90), (120, 110), (160, 85), 
-        (200, 105), (240, 95), (280, 115), (320, 100), (350, 110)
-    ]
-    
-    for i in range(len(points)-1):
-        draw.line([points[i], points[i+1]], fill=0, width=3)
-    
-    draw.arc([330, 90, 370, 130], 0, 180, fill=0, width=2)
-    return img
-
-def signature_to_fractal_seed(signature_image):
-    """Convert signature image features to fractal seed"""
-    img_array = np.array(signature_image)
-    
-    features = {}
-    ink_pixels = img_array < 128
-    features['ink_density'] = np.sum(ink_pixels) / ink_pixels.size
-    
-    vertical_profile = np.sum(ink_pixels, axis=1)
-    horizontal_profile = np.sum(ink_pixels, axis=0)
-    
-    features['vertical_center'] = np.argmax(vertical_profile) / len(vertical_profile)
-    features['horizontal_center'] = np.argmax(horizontal_profile) / len(horizontal_profile)
-    features['stroke_rhythm'] = np.std(horizontal_profile) / np.mean(horizontal_profile)
-    
-    feature_string = ''.join(f"{k}:{v:.6f}" for k, v in features.items())
-    seed = hashlib.sha256(feature_string.encode()).hexdigest()[:16]
-    
-    return seed, features
+# Shared signature helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.signature_core import create_signature_like_image, signature_to_fractal_seed
 
 def generate_visual_fractal(seed, size=100):
     """Generate a visual fractal from seed - FIXED VERSION"""
@@ -63,37 +33,39 @@ def generate_visual_fractal(seed, size=100):
     while step > 1:
         half = step // 2
         
+        # Each step reads only points fixed before it, so it is one
+        # vectorized update with its noise drawn in row-major loop order.
+        # Diamond centers whose corners fall off the grid are skipped.
+        
         # Diamond step
-        for x in range(half, size, step):
-            for y in range(half, size, step):
-                fractal[x, y] = (
-                    fractal[x - half, y - half] +
-                    fractal[x - half, y + half] +
-                    fractal[x + half, y - half] + 
-                    fractal[x + half, y + half]
-                ) / 4 + rng.uniform(-scale, scale)
+        centers = np.arange(half, size - half, step)
+        cx, cy = np.ix_(centers, centers)
+        fractal[cx, cy] = (
+            fractal[cx - half, cy - half] +
+            fractal[cx - half, cy + half] +
+            fractal[cx + half, cy - half] + 
+            fractal[cx + half, cy + half]
+        ) / 4 + rng.uniform(-scale, scale, (centers.size, centers.size))
+        
+        # Square step - rows x = 0, half, 2*half, ... each start at
+        # (x + half) % step and advance by step
+        rows = np.arange(0, size, half)
+        starts = (rows + half) % step
+        counts = (size - starts + step - 1) // step
+        first = np.cumsum(counts) - counts
+        x = np.repeat(rows, counts)
+        y = np.repeat(starts, counts) + step * (np.arange(counts.sum()) - np.repeat(first, counts))
+        
+        # Average of the in-bounds neighbors
+        total = np.zeros(x.size)
+        count = np.zeros(x.size)
+        for dx, dy in ((-half, 0), (half, 0), (0, -half), (0, half)):
+            nx, ny = x + dx, y + dy
+            inside = (nx >= 0) & (nx < size) & (ny >= 0) & (ny < size)
+            total[inside] += fractal[nx[inside], ny[inside]]
+            count += inside
         
-        # Square step - with proper bounds checking
-        for x in range(0, size, half):
-            for y in range((x + half) % step, size, step):
-                total = 0
-                count = 0
-                
-                if x >= half:
-                    total += fractal[x - half, y]
-                    count += 1
-                if x + half < size:
-                    total += fractal[x + half, y] 
-                    count += 1
-                if y >= half:
-                    total += fractal[x, y - half]
-                    count += 1
-                if y + half < size:
-                    total += fractal[x, y + half]
-                    count += 1
-                
-                if count > 0:
-                    fractal[x, y] = total / count + rng.uniform(-scale, scale)
+        fractal[x, y] = total / count + rng.uniform(-scale, scale, x.size)
         
         step = half
         scale *= 0.5
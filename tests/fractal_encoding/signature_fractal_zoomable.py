@@ -4,45 +4,15 @@ Signature to ZOOMABLE Visual Fractal - The "Wow Factor"
 """
 
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # figures are only ever saved to PNG
 import matplotlib.pyplot as plt
-from PIL import Image, ImageDraw
-import hashlib
+import os
+import sys
 
-def create_signature_like_image():
-    """Create a simulated signature"""
-    img = Image.new('L', (400, 200), color=255)
-    draw = ImageDraw.Draw(img)
-    
-    points = [
-        (50, 100), (80, 90), (120, 110), (160, 85), 
-        (200, 105), (240, 95), (280, 115), (320, 100), (350, 110)
-    ]
-    
-    for i in range(len(points)-1):
-        draw.line([points[i], points[i+1]], fill=0, width=3)
-    
-    draw.arc([330, 90, 370, 130], 0, 180, fill=0, width=2)
-    return img
-
-def signature_to_fractal_seed(signature_image):
-    """Convert signature image features to fractal seed"""
-    img_array = np.array(signature_image)
-    
-    features = {}
-    ink_pixels = img_array < 128
-    features['ink_density'] = np.sum(ink_pixels) / ink_pixels.size
-    
-    vertical_profile = np.sum(ink_pixels, axis=1)
-    horizontal_profile = np.sum(ink_pixels, axis=0)
-    
-    features['vertical_center'] = np.argmax(vertical_profile) / len(vertical_profile)
-    features['horizontal_center'] = np.argmax(horizontal_profile) / len(horizontal_profile)
-    features['stroke_rhythm'] = np.std(horizontal_profile) / np.mean(horizontal_profile)
-    
-    feature_string = ''.join(f"{k}:{v:.6f}" for k, v in features.items())
-    seed = hashlib.sha256(feature_string.encode()).hexdigest()[:16]
-    
-    return seed, features
+# Shared signature helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.signature_core import create_signature_like_image, signature_to_fractal_seed
 
 def generate_zoomable_fractal(seed, base_size=200):
     """Generate a true zoomable fractal with multiple zoom levels"""
@@ -54,8 +24,9 @@ def generate_zoomable_fractal(seed, base_size=200):
     for zoom_factor in [1.0, 4.0, 16.0]:  # 3 zoom levels
         size = base_size
         x = np.linspace(0, 4 * np.pi / zoom_factor, size)
-        y = np.linspace(0, 4 * np.pi / zoom_factor, size)
-        X, Y = np.meshgrid(x, y)
+        # Every term is sin(x-only) * cos(y-only), so evaluate them on the
+        # axes and broadcast the products instead of building a meshgrid
+        Y = np.linspace(0, 4 * np.pi / zoom_factor, size)[:, np.newaxis]
         
         # Use seed to determine unique parameters for each zoom
         freq1 = 1 + rng.uniform(0.5, 3.0)
@@ -63,17 +34,18 @@ def generate_zoomable_fractal(seed, base_size=200):
         phase1 = rng.uniform(0, 2 * np.pi)
         phase2 = rng.uniform(0, 2 * np.pi)
         
-        # Complex fractal formula
-        fractal = (np.sin(freq1 * X + phase1) * 
-                   np.cos(freq2 * Y + phase2) +
-                   0.3 * np.sin(3 * freq1 * X) *
-                   np.cos(3 * freq2 * Y) +
-                   0.1 * np.sin(7 * freq1 * X) *
-                   np.cos(7 * freq2 * Y))
+        # Complex fractal formula, accumulated in place through one
+        # scratch buffer for the harmonics
+        fractal = np.sin(freq1 * x + phase1) * np.cos(freq2 * Y + phase2)
+        harmonic = np.multiply(0.3 * np.sin(3 * freq1 * x), np.cos(3 * freq2 * Y))
+        fractal += harmonic
+        np.multiply(0.1 * np.sin(7 * freq1 * x), np.cos(7 * freq2 * Y), out=harmonic)
+        fractal += harmonic
         
         # Add seeded noise for texture
         noise = rng.normal(0, 1, (size, size))
-        fractal += 0.05 * noise
+        noise *= 0.05
+        fractal += noise
         
         zoom_levels.append(fractal)
     
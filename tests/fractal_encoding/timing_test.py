@@ -8,91 +8,46 @@ import matplotlib.pyplot as plt
 from scipy import signal
 import soundfile as sf
 import hashlib
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    """Generate deterministic fractal pattern from seed"""
-    # Use seed to create reproducible fractal noise
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    
-    # Generate fractal noise using midpoint displacement
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    
-    step = length // 2
-    scale = 1.0
-    
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    
-    return pattern
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import apply_time_shifts, chunk_shifts, create_test_audio, generate_fractal_pattern
 
 def encode_timing_fractal(audio, fractal_pattern, max_shift_ms=2):
     """
     Encode fractal pattern using micro-timing variations
     max_shift_ms: Maximum timing shift in milliseconds (inaudible range)
     """
-    sample_rate = 44100  # Standard audio rate
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    
-    # Normalize fractal pattern to ±1 range
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
     # Apply timing shifts to audio chunks
     chunk_size = 512  # ~11ms chunks
-    encoded_audio = []
     
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            # Calculate timing shift for this chunk
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            
-            # Apply time shift using phase rotation
-            if shift_samples != 0:
-                chunk = np.roll(chunk, shift_samples)
-                # Handle rollover artifacts
-                if shift_samples > 0:
-                    chunk[:shift_samples] = 0
-                else:
-                    chunk[shift_samples:] = 0
-            
-        encoded_audio.extend(chunk)
+    # Float copy of the audio; all whole chunks are time-shifted in place
+    # in one batch, with the samples rolled in from outside zeroed
+    encoded_audio = np.array(audio, dtype=float)
+    n_chunks = len(encoded_audio) // chunk_size
+    frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    apply_time_shifts(frames, chunk_shifts(fractal_pattern, n_chunks, max_shift_ms), out=frames)
     
-    return np.array(encoded_audio)
+    return encoded_audio
 
 def detect_timing_fractal(original_audio, test_audio, seed, chunk_size=512):
     """Detect if test audio contains the fractal timing pattern"""
     fractal_pattern = generate_fractal_pattern(seed, 100)
     sample_rate = 44100
     
-    correlation_scores = []
-    
-    for i in range(0, min(len(original_audio), len(test_audio)), chunk_size):
-        orig_chunk = original_audio[i:i + chunk_size]
-        test_chunk = test_audio[i:i + chunk_size]
-        
-        if len(orig_chunk) == chunk_size and len(test_chunk) == chunk_size:
-            # Cross-correlation to detect timing shifts
-            correlation = np.correlate(orig_chunk, test_chunk, mode='valid')
-            correlation_scores.append(np.max(correlation))
+    # Cross-correlation to detect timing shifts. For two equal-length chunks
+    # mode='valid' correlation is their single zero-lag dot product, so score
+    # every whole chunk with one row-wise product
+    n_chunks = min(len(original_audio), len(test_audio)) // chunk_size
+    orig_chunks = np.reshape(original_audio[:n_chunks * chunk_size], (n_chunks, chunk_size))
+    test_chunks = np.reshape(test_audio[:n_chunks * chunk_size], (n_chunks, chunk_size))
+    correlation_scores = np.einsum('ij,ij->i', orig_chunks, test_chunks)
     
     avg_correlation = np.mean(correlation_scores)
     return avg_correlation, correlation_scores
 
-# Test with a simple sine wave
-def create_test_audio(duration_seconds=2, frequency=440):
-    """Create test audio signal"""
-    sample_rate = 44100
-    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
-    audio = 0.5 * np.sin(2 * np.pi * frequency * t)
-    return audio
-
 # Run the test
 if __name__ == "__main__":
     print("🔬 FRACTAL TIMING ENCODING TEST")
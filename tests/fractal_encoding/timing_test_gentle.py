@@ -5,78 +5,27 @@ Gentle fractal timing test - reduced strength for audibility
 
 import numpy as np
 import soundfile as sf
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    """Generate deterministic fractal pattern from seed"""
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    
-    step = length // 2
-    scale = 1.0
-    
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    
-    return pattern
-
-def apply_smooth_shift(chunk, shift_samples):
-    """Apply timing shift with crossfade to avoid clicks"""
-    if shift_samples > 0:
-        # Shift right with fade
-        shifted = np.roll(chunk, shift_samples)
-        shifted[:shift_samples] = 0
-        # Crossfade the transition
-        fade_length = min(50, shift_samples)
-        if fade_length > 0:
-            fade_in = np.linspace(0, 1, fade_length)
-            shifted[:fade_length] *= fade_in
-    else:
-        # Shift left
-        shift_samples = abs(shift_samples)
-        shifted = np.roll(chunk, -shift_samples)
-        shifted[-shift_samples:] = 0
-        fade_length = min(50, shift_samples)
-        if fade_length > 0:
-            fade_out = np.linspace(1, 0, fade_length)
-            shifted[-fade_length:] *= fade_out
-    return shifted
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import apply_time_shifts, chunk_shifts, create_test_audio, generate_fractal_pattern
 
 def encode_timing_fractal_gentle(audio, fractal_pattern, max_shift_ms=0.5):
     """Gentle encoding - much smaller timing shifts"""
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
-    encoded_audio = []
     chunk_size = 1024
     
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            
-            if shift_samples != 0:
-                # Use smooth crossfade instead of hard roll
-                chunk = apply_smooth_shift(chunk, shift_samples)
-            
-        encoded_audio.extend(chunk)
+    # Float copy of the audio; all whole chunks are time-shifted in place
+    # in one batch with a 50-sample fade at the zeroed edge, the trailing
+    # partial chunk passes through
+    encoded_audio = np.array(audio, dtype=float)
+    n_chunks = len(encoded_audio) // chunk_size
+    frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    apply_time_shifts(frames, chunk_shifts(fractal_pattern, n_chunks, max_shift_ms),
+                      out=frames, fade_length=50)
     
-    return np.array(encoded_audio)
-
-def create_test_audio(duration_seconds=2, frequency=440):
-    """Create test audio signal"""
-    sample_rate = 44100
-    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
-    audio = 0.5 * np.sin(2 * np.pi * frequency * t)
-    return audio
+    return encoded_audio
 
 if __name__ == "__main__":
     print("🔬 GENTLE FRACTAL TIMING TEST")
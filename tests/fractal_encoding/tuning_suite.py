@@ -6,71 +6,56 @@ Progressive tuning - test multiple encoding strengths
 import numpy as np
 import soundfile as sf
 import subprocess
-import time
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_smooth_shift(chunk, shift_samples):
-    if shift_samples > 0:
-        shifted = np.roll(chunk, shift_samples)
-        shifted[:shift_samples] = 0
-        fade_length = min(50, shift_samples)
-        if fade_length > 0:
-            fade_in = np.linspace(0, 1, fade_length)
-            shifted[:fade_length] *= fade_in
-    else:
-        shift_samples = abs(shift_samples)
-        shifted = np.roll(chunk, -shift_samples)
-        shifted[-shift_samples:] = 0
-        fade_length = min(50, shift_samples)
-        if fade_length > 0:
-            fade_out = np.linspace(1, 0, fade_length)
-            shifted[-fade_length:] *= fade_out
-    return shifted
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import apply_time_shifts, chunk_shifts, create_test_audio, generate_fractal_pattern
 
 def encode_timing_fractal(audio, fractal_pattern, max_shift_ms, chunk_size=1024):
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
-    encoded_audio = []
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            if shift_samples != 0:
-                chunk = apply_smooth_shift(chunk, shift_samples)
-        encoded_audio.extend(chunk)
-    return np.array(encoded_audio)
-
-def create_test_audio(duration_seconds=2, frequency=440):
-    sample_rate = 44100
-    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
-    return 0.5 * np.sin(2 * np.pi * frequency * t)
-
-def play_file(filename, description):
+    # Float copy of the audio; all whole chunks are time-shifted in place
+    # in one batch with a 50-sample fade at the zeroed edge, the trailing
+    # partial chunk passes through
+    encoded_audio = np.array(audio, dtype=float)
+    n_chunks = len(encoded_audio) // chunk_size
+    frames = encoded_audio[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    apply_time_shifts(frames, chunk_shifts(fractal_pattern, n_chunks, max_shift_ms),
+                      out=frames, fade_length=50)
+    return encoded_audio
+
+def open_player(sample_rate=44100):
+    """One aplay process fed raw float32 PCM for every clip, instead of one per file"""
+    try:
+        return subprocess.Popen(['aplay', '-q', '-f', 'FLOAT_LE', '-r', str(sample_rate), '-c', '1'],
+                                stdin=subprocess.PIPE)
+    except OSError:
+        return None
+
+def play_file(player, filename, description):
     print(f"🎵 {description}")
     print(f"   File: {filename}")
+    # Play what was saved (16-bit), followed by 1.5s of silence between clips
+    audio, sample_rate = sf.read(filename, dtype='float32')
+    pause = np.zeros(int(sample_rate * 1.5), dtype=np.float32)
     try:
-        subprocess.run(['aplay', filename], check=True)
-    except subprocess.CalledProcessError:
+        if player is None:
+            raise BrokenPipeError
+        player.stdin.write(audio.astype('<f4', copy=False).tobytes())
+        player.stdin.write(pause.astype('<f4', copy=False).tobytes())
+    except BrokenPipeError:
         print(f"   ❌ Could not play {filename}")
-    time.sleep(1.5)
+
+def close_player(player):
+    """Let the queued clips finish playing"""
+    if player is None:
+        return
+    try:
+        player.stdin.close()
+    except BrokenPipeError:
+        pass
+    player.wait()
 
 # Test different encoding strengths
 strengths = [
@@ -92,17 +77,35 @@ fractal_pattern = generate_fractal_pattern(seed, 100)
 # Save original
 sf.write('tests/fractal_encoding/original_tuning.wav', original_audio, 44100)
 
-# Generate all encoded versions
-for strength_ms, description in strengths:
-    print(f"\n🔧 Encoding with {strength_ms}ms shifts...")
+# Every strength is correlated against the same original, so center it and
+# take its norm once; each encoded version then costs two dot products
+original_centered = original_audio - np.mean(original_audio)
+original_norm = np.sqrt(original_centered @ original_centered)
+
+def correlation_with_original(encoded):
+    """Pearson correlation of an encoded version with original_audio"""
+    encoded_centered = encoded - np.mean(encoded)
+    return (original_centered @ encoded_centered) / (original_norm * np.sqrt(encoded_centered @ encoded_centered))
+
+def encode_strength(strength_ms):
+    """Encode, save and measure one strength; returns (correlation, max_diff)"""
     encoded = encode_timing_fractal(original_audio, fractal_pattern, strength_ms)
     
     filename = f'tests/fractal_encoding/encoded_{strength_ms}ms.wav'
     sf.write(filename, encoded, 44100)
     
-    correlation = np.corrcoef(original_audio, encoded)[0,1]
+    correlation = correlation_with_original(encoded)
     max_diff = np.max(np.abs(encoded - original_audio))
-    
+    return correlation, max_diff
+
+# Generate all encoded versions up front, overlapping the NumPy work and
+# the WAV writes; results are reported in strength order and playback
+# below stays serial
+with ThreadPoolExecutor(max_workers=len(strengths)) as executor:
+    results = list(executor.map(encode_strength, [strength_ms for strength_ms, _ in strengths]))
+
+for (strength_ms, description), (correlation, max_diff) in zip(strengths, results):
+    print(f"\n🔧 Encoding with {strength_ms}ms shifts...")
     print(f"   📊 Correlation: {correlation:.4f}")
     print(f"   🎧 Max difference: {max_diff:.6f}")
 
@@ -111,11 +114,14 @@ print("🎵 NOW PLAYING ALL VERSIONS FOR COMPARISON")
 print("="*50)
 
 # Play all versions for comparison
-play_file('tests/fractal_encoding/original_tuning.wav', 'ORIGINAL - Clean reference tone')
+player = open_player()
+play_file(player, 'tests/fractal_encoding/original_tuning.wav', 'ORIGINAL - Clean reference tone')
 
 for strength_ms, description in strengths:
     filename = f'tests/fractal_encoding/encoded_{strength_ms}ms.wav'
-    play_file(filename, description)
+    play_file(player, filename, description)
+
+close_player(player)
 
 print("\n🎯 LISTENING COMPLETE!")
 print("Please note which version is the best balance:")
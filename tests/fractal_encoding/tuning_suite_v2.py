@@ -6,70 +6,44 @@ Tuning suite v2 - fix the crackle and go ultra-gentle
 import numpy as np
 import soundfile as sf
 import subprocess
-import time
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_phase_shift(chunk, shift_samples):
-    """Use phase rotation instead of time shifting to avoid crackles"""
-    if shift_samples == 0:
-        return chunk
-    
-    # Apply phase shift in frequency domain (no samples lost)
-    freq_domain = np.fft.fft(chunk)
-    angles = np.angle(freq_domain)
-    
-    # Create phase shift - linear phase gradient
-    phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-    new_angles = angles + phase_shift
-    
-    # Reconstruct with new phase
-    freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-    return np.real(np.fft.ifft(freq_domain_shifted))
-
-def encode_phase_fractal(audio, fractal_pattern, max_shift_ms, chunk_size=2048):
-    """Encode using phase shifts instead of time shifts - NO CRACKLES"""
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    
-    encoded_audio = []
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            chunk = apply_phase_shift(chunk, shift_samples)
-        encoded_audio.extend(chunk)
-    return np.array(encoded_audio)
-
-def create_test_audio(duration_seconds=2, frequency=440):
-    sample_rate = 44100
-    t = np.linspace(0, duration_seconds, int(sample_rate * duration_seconds))
-    return 0.5 * np.sin(2 * np.pi * frequency * t)
-
-def play_file(filename, description):
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import create_test_audio, encode_phase_fractal, generate_fractal_pattern
+
+def open_player(sample_rate=44100):
+    """One aplay process fed raw float32 PCM for every clip, instead of one per file"""
+    try:
+        return subprocess.Popen(['aplay', '-q', '-f', 'FLOAT_LE', '-r', str(sample_rate), '-c', '1'],
+                                stdin=subprocess.PIPE)
+    except OSError:
+        return None
+
+def play_file(player, filename, description):
     print(f"🎵 {description}")
     print(f"   File: {filename}")
+    # Play what was saved (16-bit), followed by 1.5s of silence between clips
+    audio, sample_rate = sf.read(filename, dtype='float32')
+    pause = np.zeros(int(sample_rate * 1.5), dtype=np.float32)
     try:
-        subprocess.run(['aplay', filename], check=True)
-    except subprocess.CalledProcessError:
+        if player is None:
+            raise BrokenPipeError
+        player.stdin.write(audio.astype('<f4', copy=False).tobytes())
+        player.stdin.write(pause.astype('<f4', copy=False).tobytes())
+    except BrokenPipeError:
         print(f"   ❌ Could not play {filename}")
-    time.sleep(1.5)
+
+def close_player(player):
+    """Let the queued clips finish playing"""
+    if player is None:
+        return
+    try:
+        player.stdin.close()
+    except BrokenPipeError:
+        pass
+    player.wait()
 
 # Test ULTRA gentle phase encoding
 strengths = [
@@ -92,6 +66,16 @@ fractal_pattern = generate_fractal_pattern(seed, 100)
 # Save original
 sf.write('tests/fractal_encoding/original_phase.wav', original_audio, 44100)
 
+# Every strength is correlated against the same original, so center it and
+# take its norm once; each encoded version then costs two dot products
+original_centered = original_audio - np.mean(original_audio)
+original_norm = np.sqrt(original_centered @ original_centered)
+
+def correlation_with_original(encoded):
+    """Pearson correlation of an encoded version with original_audio"""
+    encoded_centered = encoded - np.mean(encoded)
+    return (original_centered @ encoded_centered) / (original_norm * np.sqrt(encoded_centered @ encoded_centered))
+
 # Generate all encoded versions
 for strength_ms, description in strengths:
     print(f"\n🔧 Phase encoding with {strength_ms}ms shifts...")
@@ -100,7 +84,7 @@ for strength_ms, description in strengths:
     filename = f'tests/fractal_encoding/phase_{strength_ms}ms.wav'
     sf.write(filename, encoded, 44100)
     
-    correlation = np.corrcoef(original_audio, encoded)[0,1]
+    correlation = correlation_with_original(encoded)
     max_diff = np.max(np.abs(encoded - original_audio))
     
     print(f"   📊 Correlation: {correlation:.4f}")
@@ -110,11 +94,14 @@ print("\n" + "="*50)
 print("🎵 PLAYING PHASE-ENCODED VERSIONS (NO CRACKLES!)")
 print("="*50)
 
-play_file('tests/fractal_encoding/original_phase.wav', 'ORIGINAL - Clean reference')
+player = open_player()
+play_file(player, 'tests/fractal_encoding/original_phase.wav', 'ORIGINAL - Clean reference')
 
 for strength_ms, description in strengths:
     filename = f'tests/fractal_encoding/phase_{strength_ms}ms.wav'
-    play_file(filename, description)
+    play_file(player, filename, description)
+
+close_player(player)
 
 print("\n🎯 PHASE SHIFTING COMPLETE!")
 print("This method should eliminate the crackles entirely!")
@@ -4,61 +4,38 @@ Verify the sweet spot is both detectable and inaudible
 """
 
 import numpy as np
-import soundfile as sf
+import os
+import sys
 
-def generate_fractal_pattern(seed, length):
-    rng = np.random.RandomState(hash(seed) % 2**32)
-    pattern = np.zeros(length)
-    pattern[0] = rng.uniform(-1, 1)
-    step = length // 2
-    scale = 1.0
-    while step > 0:
-        for i in range(step, length, step * 2):
-            if i + step < length:
-                pattern[i] = (pattern[i - step] + pattern[i + step]) / 2
-                pattern[i] += rng.uniform(-scale, scale)
-        step //= 2
-        scale *= 0.5
-    return pattern
-
-def apply_phase_shift(chunk, shift_samples):
-    if shift_samples == 0: return chunk
-    freq_domain = np.fft.fft(chunk)
-    angles = np.angle(freq_domain)
-    phase_shift = np.linspace(0, shift_samples * 2 * np.pi / len(chunk), len(chunk))
-    new_angles = angles + phase_shift
-    freq_domain_shifted = np.abs(freq_domain) * np.exp(1j * new_angles)
-    return np.real(np.fft.ifft(freq_domain_shifted))
-
-def encode_phase_fractal(audio, fractal_pattern, max_shift_ms):
-    sample_rate = 44100
-    max_shift_samples = int((max_shift_ms / 1000) * sample_rate)
-    fractal_norm = fractal_pattern / np.max(np.abs(fractal_pattern))
-    encoded_audio = []
-    chunk_size = 2048
-    for i in range(0, len(audio), chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            pattern_idx = (i // chunk_size) % len(fractal_norm)
-            shift_samples = int(fractal_norm[pattern_idx] * max_shift_samples)
-            chunk = apply_phase_shift(chunk, shift_samples)
-        encoded_audio.extend(chunk)
-    return np.array(encoded_audio)
+# Shared fractal/encoding helpers live under scripts/fractal_encoding
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from scripts.fractal_encoding.fractal_core import encode_phase_fractal, generate_fractal_pattern
 
 # Test the sweet spot range
 sweet_spots = [0.0005, 0.001, 0.002, 0.005, 0.01]
 
-original_audio = np.sin(2 * np.pi * 440 * np.linspace(0, 2, 88200))
+# Single precision is plenty for 16-bit output and halves the FFT traffic.
+# The phase needs float64 (float32 would be off by ~4e-4 rad at 2s), so it
+# is built in one buffer and turned into the tone in place
+tone = np.linspace(0, 2, 88200)
+tone *= 2 * np.pi * 440
+original_audio = np.sin(tone, out=tone).astype(np.float32)
 seed = "artist_fractal_seed_123"
 fractal_pattern = generate_fractal_pattern(seed, 100)
 
+# Every strength is correlated against the same original, so center it and
+# take its norm once; each sweep step then costs two dot products
+original_centered = original_audio - np.mean(original_audio, dtype=np.float64)
+original_norm = np.sqrt(original_centered @ original_centered)
+
 print("🎯 SWEET SPOT VERIFICATION")
 print("Strength | Correlation | Status")
 print("-" * 40)
 
 for strength in sweet_spots:
     encoded = encode_phase_fractal(original_audio, fractal_pattern, strength)
-    correlation = np.corrcoef(original_audio, encoded)[0,1]
+    encoded_centered = encoded - np.mean(encoded, dtype=np.float64)
+    correlation = (original_centered @ encoded_centered) / (original_norm * np.sqrt(encoded_centered @ encoded_centered))
     
     detectable = correlation > 0.999
     status = "🎉 PERFECT" if detectable else "❌ Too weak"